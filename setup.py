@@ -1,9 +1,19 @@
-from setuptools import setup, find_packages
+from pathlib import Path
+
+from setuptools import setup
+
+long_description = Path(__file__).parent.joinpath("README.md").read_text(encoding="utf-8")
 
 setup(
     name="jenkins-local-init",
     version="0.1.0",
-    packages=find_packages(where="src"),
+    packages=[
+        "jenkins_local_init",
+        "jenkins_local_init.cli",
+        "jenkins_local_init.config",
+        "jenkins_local_init.core",
+        "jenkins_local_init.utils",
+    ],
     package_dir={"": "src"},
     install_requires=[
         "click>=8.0.0",
@@ -11,6 +21,9 @@ setup(
         "rich>=10.0.0",
         "requests>=2.31.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "jenkins-local-init=jenkins_local_init.cli.main:cli",
@@ -20,7 +33,7 @@ setup(
     author="Siddartha Kodaboina",
     author_email="saikumar.siddartha@gmail.com",
     description="A CLI tool to set up Jenkins infrastructure locally on macOS",
-    long_description=open("README.md").read(),
+    long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/Siddartha-Kodaboina/jenkins-local-init",
     classifiers=[
@@ -0,0 +1,214 @@
+"""
+Jenkins agent commands.
+"""
+import click
+
+from .groups import FastGroup
+from .options import add_options, ADMIN_OPTIONS
+from .services import console, ERROR_STYLE, AGENT_DOCKERFILE, get_docker_manager, get_ssh_manager, get_agent_manager
+
+@click.group(cls=FastGroup)
+def agent():
+    """Manage Jenkins agent containers."""
+    pass
+
+@agent.command()
+@click.option('--count', default=1, help='Number of agents to deploy')
+@click.option('--cpu', default='2', help='CPU limit per agent (e.g., 2)')
+@click.option('--memory', default='2g', help='Memory limit per agent (e.g., 2g)')
+@add_options(ADMIN_OPTIONS)
+def deploy(count: int, cpu: str, memory: str, admin_user: str, admin_password: str):
+    """Deploy Jenkins agent containers."""
+    docker_manager = get_docker_manager()
+    ssh_manager = get_ssh_manager()
+    agent_manager = get_agent_manager()
+    try:
+        if not ssh_manager.keys_exist():
+            console().print("[red]Error: SSH keys not found[/red]")
+            console().print("Generate SSH keys first: jenkins-local-init ssh generate")
+            return
+        
+        # Check if agent image exists
+        agent_image = agent_manager.image
+        if not docker_manager.check_image_exists(agent_image):
+            console().print(f"[yellow]Warning: Jenkins agent image '{agent_image}' not found[/yellow]")
+            console().print("Building the image now...")
+            
+            dockerfile_path = AGENT_DOCKERFILE
+            
+            if not dockerfile_path.exists():
+                console().print(f"[red]Error: Dockerfile not found at {dockerfile_path}[/red]")
+                console().print("Cannot build agent image. Please check your installation.")
+                return
+            
+            console().print(f"Building image from {dockerfile_path}...")
+            success, message = docker_manager.build_image(dockerfile_path, agent_image)
+            
+            if not success:
+                console().print(f"[red]Error: Failed to build agent image: {message}[/red]")
+                return
+                
+            console().print(f"[green]✓[/green] Successfully built Jenkins agent image")
+
+        # Agents start concurrently, so make sure the network they all join
+        # exists before any of them is created
+        success, message = docker_manager.create_network(agent_manager.network_name)
+        if not success:
+            console().print(f"Error: Failed to set up network: {message}", style=ERROR_STYLE, markup=False)
+            return
+
+        console().print(f"[bold blue]Deploying {count} Jenkins agent(s)...[/bold blue]")
+        
+        from ..core.agent_config import JenkinsAgentConfigurator
+        agent_manager.agent_configurator = JenkinsAgentConfigurator(
+            agent_manager.jenkins_url,
+            admin_user,
+            admin_password
+        )
+        
+        results = agent_manager.deploy_agents(count, cpu, memory)
+        
+        # Update this line to check for errors instead of success
+        success_count = sum(1 for r in results if not r.get('error'))
+        if success_count == count:
+            console().print(f"[green]✓[/green] Successfully deployed {count} agent(s)")
+        else:
+            console().print(f"[yellow]![/yellow] Deployed {success_count} out of {count} agent(s)")
+            
+        # Logs for all failed agents are fetched together up front
+        failed = [i for i, result in enumerate(results, 1) if result.get('error')]
+        failed_logs = dict(zip(failed, agent_manager.collect_agent_logs(failed, tail=200)))
+        
+        # Update this section to handle dictionary results
+        for i, result in enumerate(results, 1):
+            status = "[green]✓[/green]" if not result.get('error') else "[red]✗[/red]"
+            message = result.get('error') if result.get('error') else f"Agent {result['agent_name']} deployed successfully"
+            console().print(f"{status} Agent {i}: {message}")
+            
+            # Show logs for failed agents
+            if result.get('error'):
+                _, logs = failed_logs[i]
+                console().print("\n[bold red]Agent Logs:[/bold red]")
+                console().print(logs)
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+        
+@agent.command()
+@click.option('--size', default=1, help='Number of agent containers to keep ready')
+@click.option('--cpu', default='2', help='CPU limit per agent (e.g., 2)')
+@click.option('--memory', default='2g', help='Memory limit per agent (e.g., 2g)')
+def pool(size: int, cpu: str, memory: str):
+    """Pre-create stopped agent containers so deploy only has to start them."""
+    docker_manager = get_docker_manager()
+    ssh_manager = get_ssh_manager()
+    agent_manager = get_agent_manager()
+    try:
+        if not ssh_manager.keys_exist():
+            console().print("[red]Error: SSH keys not found[/red]")
+            console().print("Generate SSH keys first: jenkins-local-init ssh generate")
+            return
+        
+        success, message = docker_manager.create_network(agent_manager.network_name)
+        if not success:
+            console().print(f"Error: Failed to set up network: {message}", style=ERROR_STYLE, markup=False)
+            return
+        
+        results = agent_manager.ensure_pool(size, cpu, memory)
+        for success, message in results:
+            status = "[green]✓[/green]" if success else "[red]✗[/red]"
+            console().print(f"{status} {message}")
+        console().print(f"[bold]Pool ready:[/bold] {sum(1 for success, _ in results if success)} container(s) created")
+        
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@agent.command()
+@click.option('--tail', default=500, help='Number of log lines to show per agent')
+def logs(tail: int):
+    """Show logs for all agents."""
+    agent_manager = get_agent_manager()
+    try:
+        agents = agent_manager.list_agents()
+        
+        if not agents:
+            console().print("[yellow]No agents found[/yellow]")
+            return
+            
+        for agent in agents:
+            name = agent['name']
+            index = int(name.split('-')[-1])
+            
+            console().print(f"\n[bold blue]Logs for {name}:[/bold blue]")
+            # Raw log bytes go straight to stdout as docker produces them;
+            # Rich is only used for the header
+            for chunk in agent_manager.iter_agent_logs(index, tail):
+                click.echo(chunk, nl=False)
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@agent.command()
+def list():
+    """List all Jenkins agents."""
+    agent_manager = get_agent_manager()
+    try:
+        agents = agent_manager.list_agents()
+        
+        if not agents:
+            console().print("[yellow]No agents found[/yellow]")
+            return
+            
+        console().print("[bold blue]Jenkins Agents:[/bold blue]")
+        for agent in agents:
+            status_color = "green" if "Up" in agent['status'] else "red"
+            console().print(f"[{status_color}]{agent['name']}[/{status_color}]")
+            console().print(f"  Status: {agent['status']}")
+            console().print(f"  ID: {agent['id']}\n")
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@agent.command()
+@click.argument('index', type=int)
+def remove(index: int):
+    """Remove a specific agent from both Docker and Jenkins."""
+    agent_manager = get_agent_manager()
+    try:
+        agent_name = f"jenkins-local-agent-{index}"
+        console().print(f"[bold blue]Removing agent {agent_name}...[/bold blue]")
+        
+        success, message = agent_manager.remove_agent(index)
+        
+        # The detailed output is already handled by the agent_manager.remove_agent method
+        # Just display the final status
+        if success:
+            console().print(f"[green]✓[/green] Successfully removed agent {index}")
+        else:
+            console().print(f"[red]✗[/red] Failed to remove agent {index}")
+            console().print(f"Details: {message}")
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@agent.command()
+def remove_all():
+    """Remove all Jenkins agents from both Docker and Jenkins."""
+    agent_manager = get_agent_manager()
+    try:
+        # The detailed output is already handled by the agent_manager.remove_all_agents method
+        results = agent_manager.remove_all_agents()
+        
+        # Just display a final summary if needed
+        success_count = sum(1 for success, _ in results if success)
+        if len(results) == 0:
+            console().print("[yellow]No agents found to remove[/yellow]")
+        elif success_count == len(results):
+            # The success message is already printed by remove_all_agents
+            pass
+        else:
+            # The partial success message is already printed by remove_all_agents
+            pass
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
@@ -0,0 +1,69 @@
+"""
+Docker resource commands.
+"""
+import click
+
+from ..config.defaults import NETWORK_NAME, VOLUME_NAME
+from .groups import FastGroup
+from .services import console, ERROR_STYLE, get_config_manager, get_docker_manager
+
+@click.group(cls=FastGroup)
+def docker():
+    """Manage Docker resources for Jenkins infrastructure."""
+    pass
+
+@docker.command()
+def init():
+    """Initialize Docker network and volume."""
+    docker_manager = get_docker_manager()
+    try:
+        # Check Docker daemon
+        if not docker_manager.check_docker_running():
+            console().print("Error: Docker daemon is not running", style=ERROR_STYLE)
+            return
+
+        (network_result,), (volume_result,) = docker_manager.ensure_resources(
+            [NETWORK_NAME], [VOLUME_NAME]
+        )
+
+        # Create network
+        success, message = network_result
+        if success:
+            console().print("[green]✓[/green] Network setup successful")
+        else:
+            console().print(f"[red]✗[/red] Network setup failed: {message}")
+
+        # Create volume
+        success, message = volume_result
+        if success:
+            console().print("[green]✓[/green] Volume setup successful")
+        else:
+            console().print(f"[red]✗[/red] Volume setup failed: {message}")
+
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@docker.command()
+@click.argument('action', type=click.Choice(['backup', 'restore']))
+def volume(action):
+    """Backup or restore Jenkins volume."""
+    config_manager = get_config_manager()
+    docker_manager = get_docker_manager()
+    try:
+        backup_path = config_manager.volumes_dir / "jenkins-backup.tar.gz"
+        
+        if action == "backup":
+            success, message = docker_manager.backup_volume(VOLUME_NAME, backup_path)
+            if success:
+                console().print(f"[green]✓[/green] Volume backup created at {backup_path}")
+            else:
+                console().print(f"[red]✗[/red] Backup failed: {message}")
+        else:
+            success, message = docker_manager.restore_volume(VOLUME_NAME, backup_path)
+            if success:
+                console().print(f"[green]✓[/green] Volume restored from {backup_path}")
+            else:
+                console().print(f"[red]✗[/red] Restore failed: {message}")
+
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
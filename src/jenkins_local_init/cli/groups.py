@@ -0,0 +1,57 @@
+"""
+Click group classes used by the CLI.
+"""
+import importlib
+
+import click
+
+
+class FastGroup(click.Group):
+    """Click group that keeps its sorted command listing precomputed.
+
+    Name resolution is already a dict lookup on ``self.commands``; this also
+    avoids re-sorting the names every time help or completion lists them.
+    Subgroups created with ``@group.group()`` inherit this class.
+    """
+    group_class = type
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_command_names()
+
+    def _refresh_command_names(self):
+        self._command_names = sorted(self.commands)
+
+    def add_command(self, cmd, name=None):
+        super().add_command(cmd, name)
+        self._refresh_command_names()
+
+    def get_command(self, ctx, cmd_name):
+        return self.commands.get(cmd_name)
+
+    def list_commands(self, ctx):
+        return self._command_names
+
+
+class LazyGroup(FastGroup):
+    """Group whose subcommands live in other modules and are imported on use.
+
+    ``lazy_subcommands`` maps a command name to ``"module.path:attribute"``.
+    A module is only imported when its command is dispatched to (or listed
+    with its help text), so ``jnet agent list`` never loads the SSH or
+    ngrok command modules.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        self.lazy_subcommands = lazy_subcommands or {}
+        super().__init__(*args, **kwargs)
+
+    def _refresh_command_names(self):
+        self._command_names = sorted({*self.commands, *self.lazy_subcommands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return self.commands.get(cmd_name)
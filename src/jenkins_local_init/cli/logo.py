@@ -1,8 +1,12 @@
 """
 JNET logo display module.
 """
+import functools
+import sys
+
 from rich.console import Console
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
 
 # Jenkins colors
@@ -10,6 +14,11 @@ JENKINS_BLUE = "#335061"
 JENKINS_GREEN = "#81B0C4"
 JENKINS_LIGHT_BLUE = "#6D7F8B"
 
+# Styles parsed once at import rather than on every render
+LOGO_STYLE = Style(color=JENKINS_BLUE, bold=True)
+SUBTITLE_STYLE = Style(color=JENKINS_GREEN, bold=True)
+BORDER_STYLE = Style(color=JENKINS_LIGHT_BLUE)
+
 def get_logo():
     """Return the JNET logo as a Rich Text object."""
     logo = """
@@ -24,29 +33,36 @@ def get_logo():
     
     # Create a Text object with the logo
     text_logo = Text(logo)
-    text_logo.stylize(f"bold {JENKINS_BLUE}")
+    text_logo.stylize(LOGO_STYLE)
     
     # Add a subtitle with Jenkins green
-    subtitle = Text("\n Jenkins Network - Distributed Infrastructure Tool ", style=f"bold {JENKINS_GREEN}")
+    subtitle = Text("\n Jenkins Network - Distributed Infrastructure Tool ", style=SUBTITLE_STYLE)
     
     # Combine logo and subtitle
     full_logo = Text.assemble(text_logo, subtitle)
     
     return full_logo
 
-def display_logo():
-    """Display the JNET logo."""
+@functools.lru_cache(maxsize=1)
+def _rendered_logo() -> str:
+    """Render the logo panel to a string once; it is static."""
     console = Console()
-    logo = get_logo()
     
     # Create a panel with the logo
     panel = Panel(
-        logo,
-        border_style=JENKINS_LIGHT_BLUE,
+        get_logo(),
+        border_style=BORDER_STYLE,
         padding=(1, 2),
     )
     
-    console.print(panel)
+    with console.capture() as capture:
+        console.print(panel)
+    return capture.get()
+
+def display_logo():
+    """Display the JNET logo."""
+    sys.stdout.write(_rendered_logo())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     display_logo()
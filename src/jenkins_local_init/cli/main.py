@@ -1,202 +1,33 @@
 import click
-from rich.console import Console
-from rich.traceback import install
-from ..config.manager import ConfigManager
 from pathlib import Path
 import os
-from ..core.docker import DockerManager
-from ..core.jenkins import JenkinsMaster
-from ..core.ssh import SSHKeyManager
-from ..core.agent import JenkinsAgent
-from ..core.agent_config import JenkinsAgentConfigurator
-from ..core.ngrok import NgrokManager
-from ..cli.logo import display_logo
-
-# Install rich traceback handling
-install()
-console = Console()
-config_manager = ConfigManager()
-docker_manager = DockerManager()
-jenkins_master = JenkinsMaster(docker_manager, config_manager)
-ssh_manager = SSHKeyManager(config_manager)
-agent_manager = JenkinsAgent(docker_manager, config_manager, ssh_manager)
-ngrok_manager = NgrokManager(config_manager)
-
-@click.group()
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.defaults import NETWORK_NAME, VOLUME_NAME
+from .groups import LazyGroup
+from .options import add_options, ADMIN_OPTIONS
+from .services import console, ERROR_STYLE, AGENT_DOCKERFILE, get_config_manager, get_docker_manager, get_jenkins_master, get_ssh_manager, get_agent_manager, get_ngrok_manager
+
+def _enable_debug(ctx, param, value):
+    """Install rich traceback handling only when --debug is passed."""
+    if value:
+        from rich.traceback import install
+        install(show_locals=True)
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        name: f"{__package__}.{name}:{name}"
+        for name in ("master", "docker", "ssh", "agent", "ngrok")
+    },
+)
 @click.version_option(version="0.1.0")
+@click.option('--debug', is_flag=True, is_eager=True, expose_value=False,
+              callback=_enable_debug, help='Show detailed tracebacks on errors')
 def cli():
     """Jenkins Local Init - Set up Jenkins infrastructure locally on macOS."""
     pass
 
-@cli.group()
-def ssh():
-    """Manage SSH keys for Jenkins agents."""
-    pass
-  
-@cli.group()
-def master():
-    """Manage Jenkins master container."""
-    pass
-
-@master.command()
-@click.option('--port', type=int, help='Custom port for Jenkins web interface')
-@click.option('--jnlp-port', type=int, help='Custom port for JNLP agents')
-@click.option('--admin-user', default='admin', help='Admin username')
-@click.option('--admin-password', help='Admin password')
-def deploy(port, jnlp_port, admin_user, admin_password):
-    """Deploy Jenkins master container."""
-    try:
-        # Update ports if provided
-        if port or jnlp_port:
-            config = config_manager.get_config()
-            if port:
-                config["infrastructure"]["master"]["port"] = port
-            if jnlp_port:
-                config["infrastructure"]["master"]["jnlp_port"] = jnlp_port
-            config_manager.update_config(config)
-            
-            # Reinitialize Jenkins master with new config
-            global jenkins_master
-            jenkins_master = JenkinsMaster(docker_manager, config_manager)
-
-        # Check Docker daemon
-        if not docker_manager.check_docker_running():
-            console.print("[bold red]Error: Docker daemon is not running[/bold red]")
-            return
-
-        # Initialize network and volume if they don't exist
-        docker_manager.create_network("jenkins-local-net")
-        docker_manager.create_volume("jenkins-local-data")
-
-        # Deploy master
-        console.print("[bold blue]Deploying Jenkins master...[/bold blue]")
-        success, message = jenkins_master.deploy()
-        
-        if success:
-            console.print("[green]✓[/green] Jenkins master deployed successfully")
-            
-            # Configure initial setup
-            if admin_password:
-                console.print("\n[bold blue]Configuring initial setup...[/bold blue]")
-                success, message = jenkins_master.configure_initial_setup(admin_user, admin_password)
-                if success:
-                    console.print("[green]✓[/green] Initial setup completed")
-                    console.print("\n[bold blue]Jenkins is ready![/bold blue]")
-                    console.print(f"Access Jenkins at: http://localhost:{jenkins_master.host_port}")
-                    console.print(f"Username: {admin_user}")
-                    console.print(f"Password: {admin_password}")
-                else:
-                    console.print(f"[red]✗[/red] Initial setup failed: {message}")
-            else:
-                # Show initial admin password as before
-                console.print("\n[bold yellow]No admin credentials provided.[/bold yellow]")
-                console.print("Jenkins will start with setup wizard.")
-                password = jenkins_master.get_admin_password()
-                if password:
-                    console.print("[green]✓[/green] Jenkins is ready!")
-                    console.print("\n[bold yellow]Initial Admin Password:[/bold yellow]")
-                    console.print(f"[bold white]{password}[/bold white]")
-                    console.print("\n[bold blue]Access Jenkins at:[/bold blue]")
-                    console.print(f"http://localhost:{jenkins_master.host_port}")
-                else:
-                    console.print("[red]✗[/red] Could not retrieve admin password")
-
-        else:
-            console.print(f"[red]✗[/red] Deployment failed: {message}")
-
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@master.command()
-def status():
-    """Check Jenkins master status."""
-    try:
-        if jenkins_master.is_running():
-            console.print("[green]✓[/green] Jenkins master is running")
-            console.print("\n[bold blue]Container Logs:[/bold blue]")
-            _, logs = jenkins_master.get_logs()
-            console.print(logs)
-        else:
-            console.print("[red]✗[/red] Jenkins master is not running")
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@master.command()
-@click.argument('action', type=click.Choice(['start', 'stop', 'restart']))
-def control(action):
-    """Control Jenkins master container (start/stop/restart)."""
-    try:
-        if action == 'start':
-            success, message = jenkins_master.start()
-        elif action == 'stop':
-            success, message = jenkins_master.stop()
-        else:  # restart
-            jenkins_master.stop()
-            success, message = jenkins_master.start()
-
-        if success:
-            console.print(f"[green]✓[/green] Successfully {action}ed Jenkins master")
-        else:
-            console.print(f"[red]✗[/red] Action failed: {message}")
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-
-@cli.group()
-def docker():
-    """Manage Docker resources for Jenkins infrastructure."""
-    pass
-
-@docker.command()
-def init():
-    """Initialize Docker network and volume."""
-    try:
-        # Check Docker daemon
-        if not docker_manager.check_docker_running():
-            console.print("[bold red]Error: Docker daemon is not running[/bold red]")
-            return
-
-        # Create network
-        success, message = docker_manager.create_network("jenkins-local-net")
-        if success:
-            console.print("[green]✓[/green] Network setup successful")
-        else:
-            console.print(f"[red]✗[/red] Network setup failed: {message}")
-
-        # Create volume
-        success, message = docker_manager.create_volume("jenkins-local-data")
-        if success:
-            console.print("[green]✓[/green] Volume setup successful")
-        else:
-            console.print(f"[red]✗[/red] Volume setup failed: {message}")
-
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@docker.command()
-@click.argument('action', type=click.Choice(['backup', 'restore']))
-def volume(action):
-    """Backup or restore Jenkins volume."""
-    try:
-        backup_path = Path(config_manager.get_config()["directories"]["volumes"]) / "jenkins-backup.tar.gz"
-        
-        if action == "backup":
-            success, message = docker_manager.backup_volume("jenkins-local-data", backup_path)
-            if success:
-                console.print(f"[green]✓[/green] Volume backup created at {backup_path}")
-            else:
-                console.print(f"[red]✗[/red] Backup failed: {message}")
-        else:
-            success, message = docker_manager.restore_volume("jenkins-local-data", backup_path)
-            if success:
-                console.print(f"[green]✓[/green] Volume restored from {backup_path}")
-            else:
-                console.print(f"[red]✗[/red] Restore failed: {message}")
-
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-
 @cli.command()
 @click.option(
     "--agents",
@@ -216,18 +47,7 @@ def volume(action):
     help="Number of CPUs for agents",
     type=int
 )
-@click.option(
-    "--admin-user",
-    default="admin",
-    help="Jenkins admin username",
-    type=str
-)
-@click.option(
-    "--admin-password",
-    default="admin",
-    help="Jenkins admin password",
-    type=str
-)
+@add_options(ADMIN_OPTIONS)
 @click.option(
     "--public",
     is_flag=True,
@@ -235,11 +55,17 @@ def volume(action):
 )
 def setup(agents: int, memory: str, cpus: int, admin_user: str, admin_password: str, public: bool):
     """Set up complete Jenkins infrastructure with specified configuration."""
+    config_manager = get_config_manager()
+    docker_manager = get_docker_manager()
+    ssh_manager = get_ssh_manager()
+    ngrok_manager = get_ngrok_manager()
+    jenkins_master = get_jenkins_master()
+    agent_manager = get_agent_manager()
     try:
-        console.print("[bold blue]Starting complete Jenkins infrastructure setup...[/bold blue]")
+        console().print("[bold blue]Starting complete Jenkins infrastructure setup...[/bold blue]")
         
         # Step 1: Initialize configuration
-        console.print("\n[bold]Step 1/8: Initializing configuration...[/bold]")
+        console().print("\n[bold]Step 1/8: Initializing configuration...[/bold]")
         config_manager.init_directories()
         
         # Update configuration with CLI parameters
@@ -250,105 +76,121 @@ def setup(agents: int, memory: str, cpus: int, admin_user: str, admin_password:
                 "cpus": cpus
             }
         })
-        
-        console.print("[green]✓[/green] Configuration initialized")
-        console.print(f"Config directory: {config_manager.config['directories']['config']}")
-        console.print("\n[bold]Infrastructure Configuration:[/bold]")
-        console.print(f"Agents: {agents}")
-        console.print(f"Memory: {memory}")
-        console.print(f"CPUs: {cpus}")
+        # Read once; every later step uses this same dict
+        cfg = config_manager.get_config()
+        
+        # Each step's report is rendered and written in one go
+        with console() as out:
+            out.print("[green]✓[/green] Configuration initialized")
+            out.print(f"Config directory: {cfg['directories']['config']}")
+            out.print("\n[bold]Infrastructure Configuration:[/bold]")
+            out.print(f"Agents: {agents}")
+            out.print(f"Memory: {memory}")
+            out.print(f"CPUs: {cpus}")
         
         # Step 2: Initialize Docker resources
-        console.print("\n[bold]Step 2/8: Setting up Docker resources...[/bold]")
+        console().print("\n[bold]Step 2/8: Setting up Docker resources...[/bold]")
         
         # Check Docker daemon
         if not docker_manager.check_docker_running():
-            console.print("[bold red]Error: Docker daemon is not running[/bold red]")
+            console().print("Error: Docker daemon is not running", style=ERROR_STYLE)
             return
             
-        # Create network
-        success, message = docker_manager.create_network("jenkins-local-net")
-        if success:
-            console.print("[green]✓[/green] Network setup successful")
-        else:
-            console.print(f"[yellow]![/yellow] Network setup note: {message}")
+        # Docker resources, SSH keys and the agent image lookup don't depend
+        # on each other, so run them together and report in step order
+        agent_image = agent_manager.image
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            resources_future = executor.submit(
+                docker_manager.ensure_resources, [NETWORK_NAME], [VOLUME_NAME]
+            )
+            keys_future = None if ssh_manager.keys_exist() else executor.submit(ssh_manager.generate_key_pair)
+            image_future = executor.submit(docker_manager.check_image_exists, agent_image)
+        (network_result,), (volume_result,) = resources_future.result()
+
+        with console() as out:
+            # Create network
+            success, message = network_result
+            if success:
+                out.print("[green]✓[/green] Network setup successful")
+            else:
+                out.print(f"[yellow]![/yellow] Network setup note: {message}")
 
-        # Create volume
-        success, message = docker_manager.create_volume("jenkins-local-data")
-        if success:
-            console.print("[green]✓[/green] Volume setup successful")
-        else:
-            console.print(f"[yellow]![/yellow] Volume setup note: {message}")
+            # Create volume
+            success, message = volume_result
+            if success:
+                out.print("[green]✓[/green] Volume setup successful")
+            else:
+                out.print(f"[yellow]![/yellow] Volume setup note: {message}")
             
         # Step 3: Generate SSH keys
-        console.print("\n[bold]Step 3/8: Setting up SSH keys...[/bold]")
+        console().print("\n[bold]Step 3/8: Setting up SSH keys...[/bold]")
         
-        if ssh_manager.keys_exist():
-            console.print("[green]✓[/green] SSH keys already exist")
+        if keys_future is None:
+            console().print("[green]✓[/green] SSH keys already exist")
         else:
-            success, message = ssh_manager.generate_key_pair()
+            success, message = keys_future.result()
             if success:
-                console.print("[green]✓[/green] SSH key pair generated successfully")
+                console().print("[green]✓[/green] SSH key pair generated successfully")
             else:
-                console.print(f"[red]✗[/red] Failed to generate SSH keys: {message}")
+                console().print(f"[red]✗[/red] Failed to generate SSH keys: {message}")
                 return
                 
         # Step 4: Set up Ngrok if public flag is set
         public_url = None
         if public:
-            console.print("\n[bold]Step 4/8: Setting up public access with Ngrok...[/bold]")
+            console().print("\n[bold]Step 4/8: Setting up public access with Ngrok...[/bold]")
             
             # Check if ngrok is installed
             if not ngrok_manager.is_installed():
-                console.print("[red]✗[/red] Ngrok is not installed. Please install it first:")
-                console.print("  brew install ngrok/ngrok/ngrok  # macOS with Homebrew")
-                console.print("  or download from https://ngrok.com/download")
+                console().print("[red]✗[/red] Ngrok is not installed. Please install it first:")
+                console().print("  brew install ngrok/ngrok/ngrok  # macOS with Homebrew")
+                console().print("  or download from https://ngrok.com/download")
                 return
             
             # Check if ngrok is authenticated
             if not ngrok_manager.is_authenticated():
-                console.print("[red]✗[/red] Ngrok is not authenticated. Please run:")
-                console.print("  jenkins-local-init ngrok auth <your-token>")
-                console.print("  Get your token at: https://dashboard.ngrok.com/get-started/your-authtoken")
+                console().print("[red]✗[/red] Ngrok is not authenticated. Please run:")
+                console().print("  jenkins-local-init ngrok auth <your-token>")
+                console().print("  Get your token at: https://dashboard.ngrok.com/get-started/your-authtoken")
                 return
             
             # Start the tunnel
-            jenkins_port = config_manager.get_config()["infrastructure"]["master"]["port"]
+            jenkins_port = cfg["infrastructure"]["master"]["port"]
             success, message = ngrok_manager.start_tunnel(jenkins_port)
             
             # Check if tunnel is actually running
             public_url = ngrok_manager.get_public_url()
             if public_url:
-                console.print(f"[green]✓[/green] Ngrok tunnel started successfully")
-                console.print(f"Public URL: {public_url}")
+                console().print(f"[green]✓[/green] Ngrok tunnel started successfully")
+                console().print(f"Public URL: {public_url}")
             else:
-                console.print(f"[red]✗[/red] Failed to start ngrok tunnel: {message}")
-                console.print("Continuing setup without public URL...")
+                console().print(f"[red]✗[/red] Failed to start ngrok tunnel: {message}")
+                console().print("Continuing setup without public URL...")
                 
         # Step 5: Deploy Jenkins master (was Step 4)
-        console.print("\n[bold]Step 5/8: Deploying Jenkins master...[/bold]")
+        console().print("\n[bold]Step 5/8: Deploying Jenkins master...[/bold]")
         
         # Deploy master with public URL if available
         success, message = jenkins_master.deploy(public_url)
         
         if not success:
-            console.print(f"[red]✗[/red] Failed to deploy Jenkins master: {message}")
+            console().print(f"[red]✗[/red] Failed to deploy Jenkins master: {message}")
             return
             
-        console.print("[green]✓[/green] Jenkins master deployed successfully")
+        console().print("[green]✓[/green] Jenkins master deployed successfully")
         
         # Configure initial setup
-        console.print("Configuring initial setup...")
+        console().print("Configuring initial setup...")
         success, message = jenkins_master.configure_initial_setup(admin_user, admin_password)
         
         if not success:
-            console.print(f"[red]✗[/red] Initial setup failed: {message}")
+            console().print(f"[red]✗[/red] Initial setup failed: {message}")
             return
             
-        console.print("[green]✓[/green] Initial setup completed")
+        console().print("[green]✓[/green] Initial setup completed")
         
         # Step 6: Install required plugins
-        console.print("\n[bold]Step 6/8: Installing required plugins...[/bold]")
+        console().print("\n[bold]Step 6/8: Installing required plugins...[/bold]")
         
         required_plugins = [
             "credentials",
@@ -367,43 +209,39 @@ def setup(agents: int, memory: str, cpus: int, admin_user: str, admin_password:
         success, message = jenkins_master.install_plugins(admin_user, admin_password, required_plugins)
         
         if success:
-            console.print(f"[green]✓[/green] {message}")
+            console().print(f"[green]✓[/green] {message}")
         else:
-            console.print(f"[red]✗[/red] {message}")
-            console.print("[yellow]![/yellow] Continuing with setup despite plugin installation issues")
+            console().print(f"[red]✗[/red] {message}")
+            console().print("[yellow]![/yellow] Continuing with setup despite plugin installation issues")
         
         # Step 7: Check and build agent image if needed
-        console.print("\n[bold]Step 7/8: Checking Jenkins agent image...[/bold]")
-        
-        # Get the agent image name from config
-        agent_image = agent_manager.image
+        console().print("\n[bold]Step 7/8: Checking Jenkins agent image...[/bold]")
         
-        # Check if the image exists
-        if docker_manager.check_image_exists(agent_image):
-            console.print(f"[green]✓[/green] Jenkins agent image '{agent_image}' already exists")
+        # Checked up front in step 2; nothing since then builds or removes it
+        if image_future.result():
+            console().print(f"[green]✓[/green] Jenkins agent image '{agent_image}' already exists")
         else:
-            console.print(f"[yellow]![/yellow] Jenkins agent image '{agent_image}' not found, building it now...")
+            console().print(f"[yellow]![/yellow] Jenkins agent image '{agent_image}' not found, building it now...")
             
-            # Get the package directory to find the Dockerfile
-            package_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent.parent.parent
-            dockerfile_path = package_dir / "docker" / "agent" / "Dockerfile"
+            dockerfile_path = AGENT_DOCKERFILE
             
             if not dockerfile_path.exists():
-                console.print(f"[red]✗[/red] Dockerfile not found at {dockerfile_path}")
-                console.print("[red]✗[/red] Cannot build agent image, setup will likely fail")
+                console().print(f"[red]✗[/red] Dockerfile not found at {dockerfile_path}")
+                console().print("[red]✗[/red] Cannot build agent image, setup will likely fail")
             else:
-                console.print(f"Building image from {dockerfile_path}...")
+                console().print(f"Building image from {dockerfile_path}...")
                 success, message = docker_manager.build_image(dockerfile_path, agent_image)
                 
                 if success:
-                    console.print(f"[green]✓[/green] Successfully built Jenkins agent image")
+                    console().print(f"[green]✓[/green] Successfully built Jenkins agent image")
                 else:
-                    console.print(f"[red]✗[/red] Failed to build agent image: {message}")
-                    console.print("[red]✗[/red] Agent deployment will likely fail")
+                    console().print(f"[red]✗[/red] Failed to build agent image: {message}")
+                    console().print("[red]✗[/red] Agent deployment will likely fail")
             
         # Step 8: Deploy Jenkins agents
-        console.print("\n[bold]Step 8/8: Deploying Jenkins agents...[/bold]")
+        console().print("\n[bold]Step 8/8: Deploying Jenkins agents...[/bold]")
         
+        from ..core.agent_config import JenkinsAgentConfigurator
         agent_manager.agent_configurator = JenkinsAgentConfigurator(
             agent_manager.jenkins_url,
             admin_user,
@@ -412,403 +250,86 @@ def setup(agents: int, memory: str, cpus: int, admin_user: str, admin_password:
         
         results = agent_manager.deploy_agents(agents, str(cpus), memory)
         
-        success_count = len([r for r in results if not r.get('error')])
-        if success_count == agents:
-            console.print(f"[green]✓[/green] Successfully deployed {agents} agent(s)")
-        else:
-            console.print(f"[yellow]![/yellow] Deployed {success_count} out of {agents} agent(s)")
+        with console() as out:
+            success_count = sum(1 for r in results if not r.get('error'))
+            if success_count == agents:
+                out.print(f"[green]✓[/green] Successfully deployed {agents} agent(s)")
+            else:
+                out.print(f"[yellow]![/yellow] Deployed {success_count} out of {agents} agent(s)")
             
-        for i, result in enumerate(results, 1):
-            status = "[green]✓[/green]" if not result.get('error') else "[red]✗[/red]"
-            message = result.get('error') if result.get('error') else f"Agent {result['agent_name']} deployed successfully"
-            console.print(f"{status} Agent {i}: {message}")
+            for i, result in enumerate(results, 1):
+                status = "[green]✓[/green]" if not result.get('error') else "[red]✗[/red]"
+                message = result.get('error') if result.get('error') else f"Agent {result['agent_name']} deployed successfully"
+                out.print(f"{status} Agent {i}: {message}")
             
         # Final summary
+        from .logo import display_logo
         display_logo()
-        console.print("\n[bold green]Jenkins infrastructure setup complete![/bold green]")
-        
-        # Display the appropriate URL based on whether we're using Ngrok
-        if public_url:
-            console.print(f"Access Jenkins at: {public_url}")
-            console.print(f"Username: {admin_user}")
-            console.print(f"Password: {admin_password}")
-            console.print("\nUse this URL for GitHub webhooks and remote access.")
-        else:
-            console.print(f"Access Jenkins at: http://localhost:{jenkins_master.host_port}")
-            console.print(f"Username: {admin_user}")
-            console.print(f"Password: {admin_password}")
+        with console() as out:
+            out.print("\n[bold green]Jenkins infrastructure setup complete![/bold green]")
         
-        console.print("\nUse the following commands to manage your infrastructure:")
-        console.print("  jenkins-local-init master status - Check Jenkins master status")
-        console.print("  jenkins-local-init agent list - List all agents")
-        console.print("  jenkins-local-init agent logs - View agent logs")
-        if public_url:
-            console.print("  jenkins-local-init ngrok status - Check Ngrok tunnel status")
+            # Display the appropriate URL based on whether we're using Ngrok
+            if public_url:
+                out.print(f"Access Jenkins at: {public_url}")
+                out.print(f"Username: {admin_user}")
+                out.print(f"Password: {admin_password}")
+                out.print("\nUse this URL for GitHub webhooks and remote access.")
+            else:
+                out.print(f"Access Jenkins at: http://localhost:{jenkins_master.host_port}")
+                out.print(f"Username: {admin_user}")
+                out.print(f"Password: {admin_password}")
+        
+            out.print("\nUse the following commands to manage your infrastructure:")
+            out.print("  jenkins-local-init master status - Check Jenkins master status")
+            out.print("  jenkins-local-init agent list - List all agents")
+            out.print("  jenkins-local-init agent logs - View agent logs")
+            if public_url:
+                out.print("  jenkins-local-init ngrok status - Check Ngrok tunnel status")
         
     except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+def _existing_paths(paths) -> set:
+    """Return the subset of `paths` that exist, scanning each parent directory once."""
+    by_parent = {}
+    for path in paths:
+        by_parent.setdefault(Path(path).parent, []).append(path)
+
+    existing = set()
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            # Unreadable or missing parent: fall back to checking each path
+            existing.update(path for path in children if Path(path).exists())
+            continue
+        existing.update(path for path in children if Path(path).name in names)
+    return existing
 
 @cli.command()
 def status():
     """Check the status of Jenkins infrastructure."""
+    config_manager = get_config_manager()
     try:
+        from rich.table import Table
+        from rich.text import Text
+
         config = config_manager.get_config()
-        console.print("[bold blue]Jenkins Infrastructure Status[/bold blue]")
-        console.print("\n[bold green]Directories:[/bold green]")
+        console().print("[bold blue]Jenkins Infrastructure Status[/bold blue]")
+        console().print("\n[bold green]Directories:[/bold green]")
+        existing = _existing_paths(config["directories"].values())
+        table = Table(box=None, show_header=False, pad_edge=False)
         for name, path in config["directories"].items():
-            exists = Path(path).exists()
-            status = "✓" if exists else "✗"
-            color = "green" if exists else "red"
-            console.print(f"{name}: {path} [{color}]{status}[/{color}]")
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-########################################################
-# SSH Commands
-########################################################
-
-@cli.group()
-def ssh():
-    """Manage SSH keys for Jenkins agents."""
-    pass
-
-@ssh.command()
-@click.option('--force', is_flag=True, help='Force regenerate keys even if they exist')
-def generate(force):
-    """Generate SSH key pair for Jenkins agents."""
-    try:
-        
-        if ssh_manager.keys_exist() and not force:
-            console.print("[yellow]SSH keys already exist.[/yellow]")
-            console.print("Use --force to regenerate keys.")
-            return
-            
-        if force and ssh_manager.keys_exist():
-            success, message = ssh_manager.backup_keys()
-            if success:
-                console.print("[green]✓[/green] Existing keys backed up")
-            else:
-                console.print(f"[red]✗[/red] Failed to backup existing keys: {message}")
-            return
-        
-        success, message = ssh_manager.generate_key_pair()
-        
-        if success:
-            console.print("[green]✓[/green] SSH key pair generated successfully")
-            console.print("\n[bold blue]Key Locations:[/bold blue]")
-            console.print(f"Private key: {ssh_manager.get_private_key_path()}")
-            console.print(f"Public key: {ssh_manager.get_private_key_path()}.pub")
-            
-            console.print("\n[bold blue]Public Key Content:[/bold blue]")
-            console.print(ssh_manager.get_public_key())
-        else:
-            console.print(f"[red]✗[/red] Failed to generate SSH key pair: {message}")
-            
+            exists = path in existing
+            table.add_row(
+                f"{name}:",
+                path,
+                Text("✓", style="green") if exists else Text("✗", style="red")
+            )
+        console().print(table)
     except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@ssh.command()
-def show():
-    """Display the public key."""
-    try:
-        
-        if not ssh_manager.keys_exist():
-            console.print("[yellow]No SSH keys found.[/yellow]")
-            console.print("Generate keys first using: jenkins-local-init ssh generate")
-            return
-            
-        console.print("[bold blue]Public Key Content:[/bold blue]")
-        console.print(ssh_manager.get_public_key())
-        
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@ssh.command()
-def backup():
-    """Backup existing SSH keys."""
-    try:
-        
-        success, message = ssh_manager.backup_keys()
-        
-        if success:
-            console.print("[green]✓[/green] SSH keys backed up successfully")
-        else:
-            console.print(f"[red]✗[/red] {message}")
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-########################################################
-# JenkinsAgent Commands
-########################################################
-
-@cli.group()
-def agent():
-    """Manage Jenkins agent containers."""
-    pass
-
-@agent.command()
-@click.option('--count', default=1, help='Number of agents to deploy')
-@click.option('--cpu', default='2', help='CPU limit per agent (e.g., 2)')
-@click.option('--memory', default='2g', help='Memory limit per agent (e.g., 2g)')
-@click.option('--admin-user', default='admin', help='Jenkins admin username')
-@click.option('--admin-password', default='admin', help='Jenkins admin password')
-def deploy(count: int, cpu: str, memory: str, admin_user: str, admin_password: str):
-    """Deploy Jenkins agent containers."""
-    try:
-        if not ssh_manager.keys_exist():
-            console.print("[red]Error: SSH keys not found[/red]")
-            console.print("Generate SSH keys first: jenkins-local-init ssh generate")
-            return
-        
-        # Check if agent image exists
-        agent_image = agent_manager.image
-        if not docker_manager.check_image_exists(agent_image):
-            console.print(f"[yellow]Warning: Jenkins agent image '{agent_image}' not found[/yellow]")
-            console.print("Building the image now...")
-            
-            # Get the package directory to find the Dockerfile
-            package_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent.parent.parent
-            dockerfile_path = package_dir / "docker" / "agent" / "Dockerfile"
-            
-            if not dockerfile_path.exists():
-                console.print(f"[red]Error: Dockerfile not found at {dockerfile_path}[/red]")
-                console.print("Cannot build agent image. Please check your installation.")
-                return
-            
-            console.print(f"Building image from {dockerfile_path}...")
-            success, message = docker_manager.build_image(dockerfile_path, agent_image)
-            
-            if not success:
-                console.print(f"[red]Error: Failed to build agent image: {message}[/red]")
-                return
-                
-            console.print(f"[green]✓[/green] Successfully built Jenkins agent image")
-        
-        console.print(f"[bold blue]Deploying {count} Jenkins agent(s)...[/bold blue]")
-        
-        agent_manager.agent_configurator = JenkinsAgentConfigurator(
-            agent_manager.jenkins_url,
-            admin_user,
-            admin_password
-        )
-        
-        results = agent_manager.deploy_agents(count, cpu, memory)
-        
-        # Update this line to check for errors instead of success
-        success_count = len([r for r in results if not r.get('error')])
-        if success_count == count:
-            console.print(f"[green]✓[/green] Successfully deployed {count} agent(s)")
-        else:
-            console.print(f"[yellow]![/yellow] Deployed {success_count} out of {count} agent(s)")
-            
-        # Update this section to handle dictionary results
-        for i, result in enumerate(results, 1):
-            status = "[green]✓[/green]" if not result.get('error') else "[red]✗[/red]"
-            message = result.get('error') if result.get('error') else f"Agent {result['agent_name']} deployed successfully"
-            console.print(f"{status} Agent {i}: {message}")
-            
-            # Show logs for failed agents
-            if result.get('error'):
-                _, logs = agent_manager.get_agent_logs(i)
-                console.print("\n[bold red]Agent Logs:[/bold red]")
-                console.print(logs)
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-        
-@agent.command()
-def logs():
-    """Show logs for all agents."""
-    try:
-        agents = agent_manager.list_agents()
-        
-        if not agents:
-            console.print("[yellow]No agents found[/yellow]")
-            return
-            
-        for agent in agents:
-            name = agent['name']
-            index = int(name.split('-')[-1])
-            success, logs = agent_manager.get_agent_logs(index)
-            
-            console.print(f"\n[bold blue]Logs for {name}:[/bold blue]")
-            console.print(logs)
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@agent.command()
-def list():
-    """List all Jenkins agents."""
-    try:
-        agents = agent_manager.list_agents()
-        
-        if not agents:
-            console.print("[yellow]No agents found[/yellow]")
-            return
-            
-        console.print("[bold blue]Jenkins Agents:[/bold blue]")
-        for agent in agents:
-            status_color = "green" if "Up" in agent['status'] else "red"
-            console.print(f"[{status_color}]{agent['name']}[/{status_color}]")
-            console.print(f"  Status: {agent['status']}")
-            console.print(f"  ID: {agent['id']}\n")
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@agent.command()
-@click.argument('index', type=int)
-def remove(index: int):
-    """Remove a specific agent from both Docker and Jenkins."""
-    try:
-        agent_name = f"jenkins-local-agent-{index}"
-        console.print(f"[bold blue]Removing agent {agent_name}...[/bold blue]")
-        
-        success, message = agent_manager.remove_agent(index)
-        
-        # The detailed output is already handled by the agent_manager.remove_agent method
-        # Just display the final status
-        if success:
-            console.print(f"[green]✓[/green] Successfully removed agent {index}")
-        else:
-            console.print(f"[red]✗[/red] Failed to remove agent {index}")
-            console.print(f"Details: {message}")
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-@agent.command()
-def remove_all():
-    """Remove all Jenkins agents from both Docker and Jenkins."""
-    try:
-        # The detailed output is already handled by the agent_manager.remove_all_agents method
-        results = agent_manager.remove_all_agents()
-        
-        # Just display a final summary if needed
-        success_count = sum(1 for success, _ in results if success)
-        if len(results) == 0:
-            console.print("[yellow]No agents found to remove[/yellow]")
-        elif success_count == len(results):
-            # The success message is already printed by remove_all_agents
-            pass
-        else:
-            # The partial success message is already printed by remove_all_agents
-            pass
-            
-    except Exception as e:
-        console.print(f"[bold red]Error: {str(e)}[/bold red]")
-
-
-########################################################
-# Ngrok Commands
-########################################################
-
-@cli.group()
-def ngrok():
-    """Manage Ngrok tunnels for public access to Jenkins."""
-    pass
-
-@ngrok.command("auth")
-@click.argument('token', required=True)
-def ngrok_auth(token):
-    """Configure Ngrok authentication token."""
-    console.print("Configuring Ngrok authentication...", style="bold")
-    
-    success, message = ngrok_manager.authenticate(token)
-    if success:
-        console.print(f"[green]✓[/green] {message}")
-    else:
-        console.print(f"[red]✗[/red] {message}")
-
-@ngrok.command("start")
-@click.option('--admin-user', default='admin', help='Jenkins admin username')
-@click.option('--admin-password', default='admin', help='Jenkins admin password')
-def ngrok_start(admin_user, admin_password):
-    """Start Ngrok tunnel to Jenkins master."""
-    console.print("Starting Ngrok tunnel to Jenkins...", style="bold")
-    
-    # Check if ngrok is installed
-    if not ngrok_manager.is_installed():
-        console.print("[red]✗[/red] Ngrok is not installed. Please install it first:")
-        console.print("  brew install ngrok/ngrok/ngrok  # macOS with Homebrew")
-        console.print("  or download from https://ngrok.com/download")
-        return
-    
-    # Check if ngrok is authenticated
-    if not ngrok_manager.is_authenticated():
-        console.print("[red]✗[/red] Ngrok is not authenticated. Please run:")
-        console.print("  jenkins-local-init ngrok auth <your-token>")
-        console.print("  Get your token at: https://dashboard.ngrok.com/get-started/your-authtoken")
-        return
-    
-    # Check if Jenkins master is running
-    if not jenkins_master.is_running():
-        console.print("[red]✗[/red] Jenkins master is not running. Please start it first:")
-        console.print("  jenkins-local-init master start")
-        return
-    
-    # Start the tunnel
-    jenkins_port = config_manager.get_config()["infrastructure"]["master"]["port"]
-    success, message = ngrok_manager.start_tunnel(jenkins_port)
-    
-    # Check if tunnel is actually running even if the start_tunnel method reported failure
-    public_url = ngrok_manager.get_public_url()
-    if public_url:
-        console.print(f"[green]✓[/green] Ngrok tunnel started successfully")
-        console.print(f"Public URL: {public_url}")
-        
-        # Update Jenkins URL configuration
-        console.print("Updating Jenkins URL configuration...", style="bold")
-        url_success, url_message = ngrok_manager.update_jenkins_url(
-            jenkins_master, admin_user, admin_password
-        )
-        if url_success:
-            console.print(f"[green]✓[/green] {url_message}")
-        else:
-            console.print(f"[yellow]![/yellow] {url_message}")
-            console.print("You may need to manually update the Jenkins URL in the Jenkins configuration.")
-    else:
-        console.print(f"[red]✗[/red] {message}")
-        console.print("Check the logs for more details: ~/.jenkins-local/ngrok/ngrok.log")
-
-@ngrok.command("stop")
-def ngrok_stop():
-    """Stop Ngrok tunnel."""
-    console.print("Stopping Ngrok tunnel...", style="bold")
-    
-    success, message = ngrok_manager.stop_tunnel()
-    if success:
-        console.print(f"[green]✓[/green] {message}")
-    else:
-        console.print(f"[red]✗[/red] {message}")
-
-@ngrok.command("status")
-def ngrok_status():
-    """Check Ngrok tunnel status."""
-    console.print("Checking Ngrok tunnel status...", style="bold")
-    
-    if not ngrok_manager.is_installed():
-        console.print("[red]✗[/red] Ngrok is not installed")
-        return
-    
-    if not ngrok_manager.is_authenticated():
-        console.print("[red]✗[/red] Ngrok is not authenticated")
-        return
-    
-    status = ngrok_manager.get_tunnel_status()
-    if status["running"]:
-        console.print(f"[green]✓[/green] Ngrok tunnel is running")
-        console.print(f"Public URL: {status['public_url']}")
-        
-        # Show tunnel details
-        if status["tunnels"]:
-            console.print("\nActive tunnels:")
-            for tunnel in status["tunnels"]:
-                console.print(f"  - {tunnel['name']}: {tunnel['public_url']} -> {tunnel['config']['addr']}")
-    else:
-        console.print("[yellow]![/yellow] No active Ngrok tunnels")
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
 
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    cli()
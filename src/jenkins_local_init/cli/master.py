@@ -0,0 +1,117 @@
+"""
+Jenkins master commands.
+"""
+import click
+
+from ..config.defaults import NETWORK_NAME, VOLUME_NAME
+from .groups import FastGroup
+from .services import console, ERROR_STYLE, get_config_manager, get_docker_manager, get_jenkins_master
+
+@click.group(cls=FastGroup)
+def master():
+    """Manage Jenkins master container."""
+    pass
+
+@master.command()
+@click.option('--port', type=int, help='Custom port for Jenkins web interface')
+@click.option('--jnlp-port', type=int, help='Custom port for JNLP agents')
+@click.option('--admin-user', default='admin', help='Admin username')
+@click.option('--admin-password', help='Admin password')
+def deploy(port, jnlp_port, admin_user, admin_password):
+    """Deploy Jenkins master container."""
+    config_manager = get_config_manager()
+    docker_manager = get_docker_manager()
+    jenkins_master = get_jenkins_master()
+    try:
+        # Update ports if provided
+        if port or jnlp_port:
+            master_ports = {}
+            if port:
+                master_ports["port"] = port
+            if jnlp_port:
+                master_ports["jnlp_port"] = jnlp_port
+            # jenkins_master reads its ports from the config, so this is enough
+            config_manager.update_config({"infrastructure": {"master": master_ports}})
+
+        # Check Docker daemon
+        if not docker_manager.check_docker_running():
+            console().print("Error: Docker daemon is not running", style=ERROR_STYLE)
+            return
+
+        # Initialize network and volume if they don't exist
+        docker_manager.ensure_resources([NETWORK_NAME], [VOLUME_NAME])
+
+        # Deploy master
+        console().print("[bold blue]Deploying Jenkins master...[/bold blue]")
+        success, message = jenkins_master.deploy()
+        
+        if success:
+            console().print("[green]✓[/green] Jenkins master deployed successfully")
+            
+            # Configure initial setup
+            if admin_password:
+                console().print("\n[bold blue]Configuring initial setup...[/bold blue]")
+                success, message = jenkins_master.configure_initial_setup(admin_user, admin_password)
+                if success:
+                    console().print("[green]✓[/green] Initial setup completed")
+                    console().print("\n[bold blue]Jenkins is ready![/bold blue]")
+                    console().print(f"Access Jenkins at: http://localhost:{jenkins_master.host_port}")
+                    console().print(f"Username: {admin_user}")
+                    console().print(f"Password: {admin_password}")
+                else:
+                    console().print(f"[red]✗[/red] Initial setup failed: {message}")
+            else:
+                # Show initial admin password as before
+                console().print("\n[bold yellow]No admin credentials provided.[/bold yellow]")
+                console().print("Jenkins will start with setup wizard.")
+                password = jenkins_master.get_admin_password()
+                if password:
+                    console().print("[green]✓[/green] Jenkins is ready!")
+                    console().print("\n[bold yellow]Initial Admin Password:[/bold yellow]")
+                    console().print(f"[bold white]{password}[/bold white]")
+                    console().print("\n[bold blue]Access Jenkins at:[/bold blue]")
+                    console().print(f"http://localhost:{jenkins_master.host_port}")
+                else:
+                    console().print("[red]✗[/red] Could not retrieve admin password")
+
+        else:
+            console().print(f"[red]✗[/red] Deployment failed: {message}")
+
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@master.command()
+@click.option('--tail', default=500, help='Number of log lines to show')
+def status(tail: int):
+    """Check Jenkins master status."""
+    jenkins_master = get_jenkins_master()
+    try:
+        if jenkins_master.is_running():
+            console().print("[green]✓[/green] Jenkins master is running")
+            console().print("\n[bold blue]Container Logs:[/bold blue]")
+            for chunk in jenkins_master.iter_logs(tail):
+                click.echo(chunk, nl=False)
+        else:
+            console().print("[red]✗[/red] Jenkins master is not running")
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@master.command()
+@click.argument('action', type=click.Choice(['start', 'stop', 'restart']))
+def control(action):
+    """Control Jenkins master container (start/stop/restart)."""
+    jenkins_master = get_jenkins_master()
+    try:
+        if action == 'start':
+            success, message = jenkins_master.start()
+        elif action == 'stop':
+            success, message = jenkins_master.stop()
+        else:  # restart
+            success, message = jenkins_master.restart()
+
+        if success:
+            console().print(f"[green]✓[/green] Successfully {action}ed Jenkins master")
+        else:
+            console().print(f"[red]✗[/red] Action failed: {message}")
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
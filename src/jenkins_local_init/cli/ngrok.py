@@ -0,0 +1,118 @@
+"""
+Ngrok tunnel commands.
+"""
+import click
+
+from .groups import FastGroup
+from .options import add_options, ADMIN_OPTIONS
+from .services import console, get_config_manager, get_jenkins_master, get_ngrok_manager
+
+@click.group(cls=FastGroup)
+def ngrok():
+    """Manage Ngrok tunnels for public access to Jenkins."""
+    pass
+
+@ngrok.command("auth")
+@click.argument('token', required=True)
+def ngrok_auth(token):
+    """Configure Ngrok authentication token."""
+    ngrok_manager = get_ngrok_manager()
+    console().print("Configuring Ngrok authentication...", style="bold")
+    
+    success, message = ngrok_manager.authenticate(token)
+    if success:
+        console().print(f"[green]✓[/green] {message}")
+    else:
+        console().print(f"[red]✗[/red] {message}")
+
+@ngrok.command("start")
+@add_options(ADMIN_OPTIONS)
+def ngrok_start(admin_user, admin_password):
+    """Start Ngrok tunnel to Jenkins master."""
+    config_manager = get_config_manager()
+    ngrok_manager = get_ngrok_manager()
+    jenkins_master = get_jenkins_master()
+    console().print("Starting Ngrok tunnel to Jenkins...", style="bold")
+    
+    # Check if ngrok is installed
+    if not ngrok_manager.is_installed():
+        console().print("[red]✗[/red] Ngrok is not installed. Please install it first:")
+        console().print("  brew install ngrok/ngrok/ngrok  # macOS with Homebrew")
+        console().print("  or download from https://ngrok.com/download")
+        return
+    
+    # Check if ngrok is authenticated
+    if not ngrok_manager.is_authenticated():
+        console().print("[red]✗[/red] Ngrok is not authenticated. Please run:")
+        console().print("  jenkins-local-init ngrok auth <your-token>")
+        console().print("  Get your token at: https://dashboard.ngrok.com/get-started/your-authtoken")
+        return
+    
+    # Check if Jenkins master is running
+    if not jenkins_master.is_running():
+        console().print("[red]✗[/red] Jenkins master is not running. Please start it first:")
+        console().print("  jenkins-local-init master start")
+        return
+    
+    # Start the tunnel
+    jenkins_port = config_manager.get_config()["infrastructure"]["master"]["port"]
+    success, message = ngrok_manager.start_tunnel(jenkins_port)
+    
+    # Check if tunnel is actually running even if the start_tunnel method reported failure
+    public_url = ngrok_manager.get_public_url()
+    if public_url:
+        console().print(f"[green]✓[/green] Ngrok tunnel started successfully")
+        console().print(f"Public URL: {public_url}")
+        
+        # Update Jenkins URL configuration
+        console().print("Updating Jenkins URL configuration...", style="bold")
+        url_success, url_message = ngrok_manager.update_jenkins_url(
+            jenkins_master, admin_user, admin_password, public_url
+        )
+        if url_success:
+            console().print(f"[green]✓[/green] {url_message}")
+        else:
+            console().print(f"[yellow]![/yellow] {url_message}")
+            console().print("You may need to manually update the Jenkins URL in the Jenkins configuration.")
+    else:
+        console().print(f"[red]✗[/red] {message}")
+        console().print("Check the logs for more details: ~/.jenkins-local/ngrok/ngrok.log")
+
+@ngrok.command("stop")
+def ngrok_stop():
+    """Stop Ngrok tunnel."""
+    ngrok_manager = get_ngrok_manager()
+    console().print("Stopping Ngrok tunnel...", style="bold")
+    
+    success, message = ngrok_manager.stop_tunnel()
+    if success:
+        console().print(f"[green]✓[/green] {message}")
+    else:
+        console().print(f"[red]✗[/red] {message}")
+
+@ngrok.command("status")
+def ngrok_status():
+    """Check Ngrok tunnel status."""
+    ngrok_manager = get_ngrok_manager()
+    console().print("Checking Ngrok tunnel status...", style="bold")
+    
+    if not ngrok_manager.is_installed():
+        console().print("[red]✗[/red] Ngrok is not installed")
+        return
+    
+    if not ngrok_manager.is_authenticated():
+        console().print("[red]✗[/red] Ngrok is not authenticated")
+        return
+    
+    status = ngrok_manager.get_tunnel_status()
+    if status["running"]:
+        console().print(f"[green]✓[/green] Ngrok tunnel is running")
+        console().print(f"Public URL: {status['public_url']}")
+        
+        # Show tunnel details
+        if status["tunnels"]:
+            console().print("\nActive tunnels:")
+            for tunnel in status["tunnels"]:
+                console().print(f"  - {tunnel['name']}: {tunnel['public_url']} -> {tunnel['config']['addr']}")
+    else:
+        console().print("[yellow]![/yellow] No active Ngrok tunnels")
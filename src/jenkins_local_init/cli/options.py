@@ -0,0 +1,20 @@
+"""
+Option sets shared by several commands.
+"""
+import click
+
+
+def add_options(options):
+    """Apply a list of click option decorators, keeping their listed order in --help."""
+    def decorator(f):
+        for option in reversed(options):
+            f = option(f)
+        return f
+    return decorator
+
+
+# Jenkins credentials used by every command that talks to the master's API
+ADMIN_OPTIONS = [
+    click.option('--admin-user', default='admin', help='Jenkins admin username', type=str),
+    click.option('--admin-password', default='admin', help='Jenkins admin password', type=str),
+]
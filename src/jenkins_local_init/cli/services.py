@@ -0,0 +1,54 @@
+"""
+Shared CLI state: the console, output styles and lazily built managers.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from rich.style import Style
+
+
+@lru_cache(maxsize=1)
+def console():
+    """Shared Rich console, created on first output rather than at import."""
+    from rich.console import Console
+    return Console()
+
+# Checkout root and the Dockerfile used to build the agent image
+PACKAGE_DIR = Path(__file__).resolve().parents[3]
+AGENT_DOCKERFILE = PACKAGE_DIR / "docker" / "agent" / "Dockerfile"
+
+# Prebuilt style for error lines, so messages don't go through markup parsing
+ERROR_STYLE = Style(color="red", bold=True)
+
+
+# Managers are imported and constructed on first use so that `--help` and
+# commands that only need one of them don't pay for the rest.
+@lru_cache(maxsize=None)
+def get_config_manager():
+    from ..config.manager import ConfigManager
+    return ConfigManager()
+
+@lru_cache(maxsize=None)
+def get_docker_manager():
+    from ..core.docker import DockerManager
+    return DockerManager()
+
+@lru_cache(maxsize=None)
+def get_jenkins_master():
+    from ..core.jenkins import JenkinsMaster
+    return JenkinsMaster(get_docker_manager(), get_config_manager())
+
+@lru_cache(maxsize=None)
+def get_ssh_manager():
+    from ..core.ssh import SSHKeyManager
+    return SSHKeyManager(get_config_manager())
+
+@lru_cache(maxsize=None)
+def get_agent_manager():
+    from ..core.agent import JenkinsAgent
+    return JenkinsAgent(get_docker_manager(), get_config_manager(), get_ssh_manager())
+
+@lru_cache(maxsize=None)
+def get_ngrok_manager():
+    from ..core.ngrok import NgrokManager
+    return NgrokManager(get_config_manager())
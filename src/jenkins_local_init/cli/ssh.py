@@ -0,0 +1,81 @@
+"""
+SSH key commands.
+"""
+import click
+
+from .groups import FastGroup
+from .services import console, ERROR_STYLE, get_ssh_manager
+
+@click.group(cls=FastGroup)
+def ssh():
+    """Manage SSH keys for Jenkins agents."""
+    pass
+
+@ssh.command()
+@click.option('--force', is_flag=True, help='Force regenerate keys even if they exist')
+def generate(force):
+    """Generate SSH key pair for Jenkins agents."""
+    ssh_manager = get_ssh_manager()
+    try:
+        
+        if ssh_manager.keys_exist() and not force:
+            console().print("[yellow]SSH keys already exist.[/yellow]")
+            console().print("Use --force to regenerate keys.")
+            return
+            
+        if force and ssh_manager.keys_exist():
+            success, message = ssh_manager.backup_keys()
+            if success:
+                console().print("[green]✓[/green] Existing keys backed up")
+            else:
+                console().print(f"[red]✗[/red] Failed to backup existing keys: {message}")
+                return
+        
+        success, message = ssh_manager.generate_key_pair(force=force)
+        
+        if success:
+            console().print("[green]✓[/green] SSH key pair generated successfully")
+            console().print("\n[bold blue]Key Locations:[/bold blue]")
+            console().print(f"Private key: {ssh_manager.get_private_key_path()}")
+            console().print(f"Public key: {ssh_manager.get_private_key_path()}.pub")
+            
+            console().print("\n[bold blue]Public Key Content:[/bold blue]")
+            console().print(ssh_manager.get_public_key())
+        else:
+            console().print(f"[red]✗[/red] Failed to generate SSH key pair: {message}")
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@ssh.command()
+def show():
+    """Display the public key."""
+    ssh_manager = get_ssh_manager()
+    try:
+        
+        if not ssh_manager.keys_exist():
+            console().print("[yellow]No SSH keys found.[/yellow]")
+            console().print("Generate keys first using: jenkins-local-init ssh generate")
+            return
+            
+        console().print("[bold blue]Public Key Content:[/bold blue]")
+        console().print(ssh_manager.get_public_key())
+        
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
+
+@ssh.command()
+def backup():
+    """Backup existing SSH keys."""
+    ssh_manager = get_ssh_manager()
+    try:
+        
+        success, message = ssh_manager.backup_keys()
+        
+        if success:
+            console().print("[green]✓[/green] SSH keys backed up successfully")
+        else:
+            console().print(f"[red]✗[/red] {message}")
+            
+    except Exception as e:
+        console().print(f"Error: {e}", style=ERROR_STYLE, markup=False)
@@ -1,35 +1,63 @@
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
 
 # Base directories
 HOME_DIR = Path.home()
 JENKINS_LOCAL_DIR = HOME_DIR / ".jenkins-local"
 
-# Default configuration
-DEFAULT_CONFIG = {
+# Default values, also usable directly where the user can't override them
+MASTER_PORT = 8080
+MASTER_JNLP_PORT = 50000
+MASTER_CONTAINER_NAME = "jenkins-local-master"
+AGENT_CONTAINER_PREFIX = "jenkins-local-agent"
+AGENT_IMAGE = "jenkins-local-agent:latest"
+AGENT_BASE_SSH_PORT = 2222
+NETWORK_NAME = "jenkins-local-net"
+VOLUME_NAME = "jenkins-local-data"
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only mapping proxies."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a (possibly frozen) config mapping."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    return value
+
+
+# Default configuration. Read-only: use thaw(DEFAULT_CONFIG) for a copy that
+# can be modified.
+DEFAULT_CONFIG: Mapping[str, Any] = _freeze({
     "infrastructure": {
         "master": {
-            "port": 8080,
-            "jnlp_port": 50000,
+            "port": MASTER_PORT,
+            "jnlp_port": MASTER_JNLP_PORT,
             "memory": "2g",
             "cpus": 2,
-            "container_name": "jenkins-local-master",
+            "container_name": MASTER_CONTAINER_NAME,
             "image": "jenkins/jenkins:lts"
         },
         "agent": {
-            "container_name_prefix": "jenkins-local-agent",
-            "image": "jenkins-local-agent:latest",
+            "container_name_prefix": AGENT_CONTAINER_PREFIX,
+            "image": AGENT_IMAGE,
             "default_cpu": "2",
             "default_memory": "2g",
             "default_count": 1,
             "docker_socket": "/var/run/docker.sock",
             "workspace_dir": "/home/jenkins/agent",
-            "base_ssh_port": 2222 
+            "base_ssh_port": AGENT_BASE_SSH_PORT
         },
         "network": {
-            "name": "jenkins-local-net"
+            "name": NETWORK_NAME
         },
         "volume": {
-            "name": "jenkins-local-data"
+            "name": VOLUME_NAME
         },
         "ngrok": {
             "enabled": False
@@ -43,4 +71,4 @@ DEFAULT_CONFIG = {
         "ngrok": str(JENKINS_LOCAL_DIR / "ngrok"),
         "logs": str(JENKINS_LOCAL_DIR / "logs"),
     }
-}
\ No newline at end of file
+})
@@ -1,14 +1,85 @@
-import yaml
+import atexit
+import copy
+import functools
+import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
-from .defaults import DEFAULT_CONFIG, JENKINS_LOCAL_DIR
+from .defaults import DEFAULT_CONFIG, JENKINS_LOCAL_DIR, thaw
+
+@functools.lru_cache(maxsize=1)
+def _yaml() -> Tuple[Any, Any, Any]:
+    """Import PyYAML on first use; a fresh JSON sidecar means it isn't needed.
+
+    Returns (module, loader, dumper), preferring the libyaml-backed C
+    loader/dumper and falling back to pure Python.
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
+    return yaml, SafeLoader, SafeDumper
+
+# orjson is optional; the stdlib json module reads the same sidecar
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _json_loads = json.loads
+
+# Parsed config per (path, mtime, size), shared by every ConfigManager in the
+# process so constructing another manager doesn't re-read the file
+_PARSED: Dict[Tuple[str, float, int], Dict[str, Any]] = {}
+
+def _deep_merge(target: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """Merge `updates` into `target` in place, recursing into nested dicts."""
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+def _replace_file(path: Path, data: bytes) -> None:
+    """Atomically replace `path` with `data`, keeping its permissions.
+
+    The data goes to a temporary file that is swapped in, so a crash never
+    leaves a truncated file behind. Temporary files are created 0600, so the
+    old file's mode (or the umask default for a new file) is applied first.
+    """
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    with tempfile.NamedTemporaryFile('wb', dir=path.parent, delete=False) as tmp:
+        tmp.write(data)
+    try:
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
 
 class ConfigManager:
     def __init__(self):
         self.config_file = JENKINS_LOCAL_DIR / "config" / "config.yaml"
-        self.config_file = JENKINS_LOCAL_DIR / "config" / "config.yaml"
-        self.config = DEFAULT_CONFIG
+        # JSON copy of the config, read instead of the YAML while it is at
+        # least as new (i.e. the YAML hasn't been hand-edited since)
+        self.cache_file = self.config_file.parent / ".config.json.cache"
+        self.config = thaw(DEFAULT_CONFIG)
+        # (mtime, size) of the file the in-memory config was loaded from or
+        # saved to, so get_config() only reloads when it changed on disk
+        self._stamp_key: Optional[Tuple[float, int]] = None
+        # update_config() only changes memory; the file is written once at exit
+        self._dirty = False
+        atexit.register(self.flush)
         # Create initial config file if it doesn't exist
         if not self.config_file.exists():
             self.init_directories()
@@ -18,29 +89,114 @@ class ConfigManager:
             
 
     def init_directories(self) -> None:
-        """Initialize all required directories."""
+        """Initialize all required directories.
+
+        The default layout lives directly under JENKINS_LOCAL_DIR, so one
+        directory listing tells which ones already exist; only the missing
+        ones are created.
+        """
+        try:
+            with os.scandir(JENKINS_LOCAL_DIR) as entries:
+                present = {entry.path for entry in entries if entry.is_dir()}
+            present.add(str(JENKINS_LOCAL_DIR))
+        except FileNotFoundError:
+            present = set()
+
         for dir_path in self.config["directories"].values():
+            if dir_path in present:
+                continue
+            if Path(dir_path).parent != JENKINS_LOCAL_DIR and os.path.isdir(dir_path):
+                # Relocated directory the listing above can't vouch for
+                continue
             Path(dir_path).mkdir(parents=True, exist_ok=True)
 
+    def _key(self) -> Tuple[str, float, int]:
+        """Key of the config file's current on-disk state in the parse cache."""
+        st = self.config_file.stat()
+        return (str(self.config_file), st.st_mtime, st.st_size)
+
+    def _stamp(self) -> None:
+        """Remember the on-disk state the in-memory config corresponds to."""
+        key = self._key()
+        _PARSED[key] = copy.deepcopy(self.config)
+        self._stamp_key = key[1:]
+
+    def _write_cache(self, config: Any) -> None:
+        """Write the JSON sidecar for a freshly parsed or saved config."""
+        try:
+            _replace_file(self.cache_file, _json_dumps(config))
+        except (OSError, TypeError, ValueError):
+            # The sidecar is only an optimization
+            pass
+
+    def _parse(self) -> Any:
+        """Parse the config file, preferring the JSON sidecar when it is fresh."""
+        try:
+            if self.cache_file.stat().st_mtime >= self.config_file.stat().st_mtime:
+                return _json_loads(self.cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+        yaml, SafeLoader, _ = _yaml()
+        loaded_config = yaml.load(self.config_file.read_bytes(), Loader=SafeLoader)
+        self._write_cache(loaded_config)
+        return loaded_config
+
     def save_config(self) -> None:
         """Save current configuration to file."""
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            yaml.safe_dump(self.config, f, default_flow_style=False)
+        yaml, _, SafeDumper = _yaml()
+        raw = yaml.dump(self.config, Dumper=SafeDumper, default_flow_style=False).encode()
+        _replace_file(self.config_file, raw)
+        self._dirty = False
+        self._write_cache(self.config)
+        self._stamp()
+
+    def flush(self) -> None:
+        """Write pending updates to disk, if any."""
+        if self._dirty:
+            self.save_config()
 
     def load_config(self) -> None:
         """Load configuration from file if exists."""
         if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                loaded_config = yaml.safe_load(f)
-                if loaded_config:
-                    self.config.update(loaded_config)
+            key = self._key()
+            if key in _PARSED:
+                loaded_config = copy.deepcopy(_PARSED[key])
+            else:
+                loaded_config = self._parse()
+            if loaded_config:
+                self.config.update(loaded_config)
+            self._stamp()
 
     def update_config(self, new_config: Dict[str, Any]) -> None:
-        """Update configuration with new values."""
-        self.config.update(new_config)
-        self.save_config()
+        """Update configuration with new values.
+        
+        Nested sections are merged rather than replaced, so
+        {"infrastructure": {"master": {"port": 9090}}} only changes the port.
+        Changes are kept in memory and written once when the process exits
+        (or on flush()).
+        """
+        _deep_merge(self.config, new_config)
+        self._dirty = True
+
+    @functools.cached_property
+    def volumes_dir(self) -> Path:
+        """Directory that holds volume backups."""
+        return Path(self.config["directories"]["volumes"])
 
     def get_config(self) -> Dict[str, Any]:
-        """Get current configuration."""
-        return self.config
\ No newline at end of file
+        """Get current configuration.
+
+        The file is only re-parsed when its mtime or size differs from the
+        last load/save, so repeated calls within one command are free.
+        """
+        if self._dirty:
+            # In-memory changes not yet written win over the file
+            return self.config
+        try:
+            st = self.config_file.stat()
+        except FileNotFoundError:
+            return self.config
+        if self._stamp_key != (st.st_mtime, st.st_size):
+            self.load_config()
+        return self.config
@@ -1,15 +1,90 @@
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Iterator, Optional
+from collections import deque
 from pathlib import Path
 from ..core.docker import DockerManager
 from ..config.manager import ConfigManager
 from ..core.ssh import SSHKeyManager
 from rich.console import Console
+import json
+import threading
 import time
+import functools
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from ..core.agent_config import JenkinsAgentConfigurator
 
 console = Console()
+
+@functools.lru_cache(maxsize=1)
+def _detect_docker_gid() -> str:
+    """Group ID that gives agent containers access to the Docker socket.
+
+    Looked up once per process (on first deploy) and shared by all agents.
+    """
+    docker_gid = "999"  # default fallback
+    if platform.system() == "Darwin":  # macOS
+        docker_gid = "20"  # staff group ID on macOS
+    else:  # Linux
+        try:
+            docker_gid_cmd = ["getent", "group", "docker"]
+            docker_gid_result = subprocess.run(docker_gid_cmd, capture_output=True, text=True)
+            if docker_gid_result.returncode == 0:
+                docker_gid = docker_gid_result.stdout.split(':')[2]
+        except FileNotFoundError:
+            pass
+    return docker_gid
+
+@functools.lru_cache(maxsize=None)
+def _agent_name(base_name: str, index: int) -> str:
+    """Container name of agent `index`, built once per (prefix, index)."""
+    return f"{base_name}-{index}"
+
+def _read_log_tail(f, lines: Optional[int] = None, max_bytes: Optional[int] = None, block_size: int = 65536) -> bytes:
+    """Read the end of a binary log file without reading the rest of it.
+
+    Blocks are read backwards from the end until `lines` complete lines or
+    `max_bytes` bytes are available, whichever comes first; with neither
+    limit the whole file is returned.
+    """
+    end = f.seek(0, 2)
+    if lines is None and max_bytes is None:
+        f.seek(0)
+        return f.read()
+    
+    blocks = deque()
+    position = end
+    newlines = 0
+    collected = 0
+    while position > 0:
+        if max_bytes is not None and collected >= max_bytes:
+            break
+        # The final newline ends the last line rather than starting a new one
+        if lines is not None and newlines > lines:
+            break
+        size = min(block_size, position)
+        position -= size
+        f.seek(position)
+        block = f.read(size)
+        blocks.appendleft(block)
+        newlines += block.count(b'\n')
+        collected += size
+    
+    data = b''.join(blocks)
+    if max_bytes is not None:
+        data = data[-max_bytes:]
+    if lines is not None:
+        if not lines:
+            return b''
+        # Only '\n' ends a line: a '\r' (progress output) stays in its line
+        position = len(data) - 1 if data.endswith(b'\n') else len(data)
+        for _ in range(lines):
+            position = data.rfind(b'\n', 0, position)
+            if position < 0:
+                break
+        data = data[position + 1:]
+    return data
+
 class JenkinsAgent:
     def __init__(self, docker_manager: DockerManager, config_manager: ConfigManager, ssh_manager: SSHKeyManager):
         self.docker = docker_manager
@@ -22,11 +97,16 @@ class JenkinsAgent:
         self.base_name = self.agent_config["container_name_prefix"]
         self.image = self.agent_config["image"]
         self.logs_dir = Path(self.config["directories"]["logs"])
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        if not self.logs_dir.is_dir():
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
+        # Names of pre-created, stopped agent containers waiting to be started
+        self.pool_file = self.logs_dir / ".pool.json"
+        self._pool_lock = threading.Lock()
         
         # Get master configuration
         master_config = self.config["infrastructure"]["master"]
-        self.jenkins_url = f"http://localhost:{master_config['port']}"
+        # Loopback IPv4 literal: skips the name lookup for "localhost"
+        self.jenkins_url = f"http://127.0.0.1:{master_config['port']}"
         self.base_ssh_port = self.agent_config["base_ssh_port"]
         
         # Initialize agent configurator with default credentials
@@ -39,7 +119,7 @@ class JenkinsAgent:
 
     def _get_agent_name(self, index: int) -> str:
         """Generate agent container name based on index."""
-        return f"{self.base_name}-{index}"
+        return _agent_name(self.base_name, index)
     
     def _get_ssh_port(self, index: int) -> int:
         """Generate unique SSH port for each agent."""
@@ -80,13 +160,21 @@ class JenkinsAgent:
         # Configure SSH credentials in Jenkins master (only for first agent)
         if index == 1:
             cred_success, cred_message = self.agent_configurator.configure_credentials(
-                Path(self.ssh_manager.get_private_key_path())
+                private_key_text=self.ssh_manager.get_private_key()
             )
             if not cred_success:
                 result['error'] = f"Failed to configure SSH credentials: {cred_message}"
                 return result
 
-        # Configure the agent in Jenkins master
+        # Configure the agent in Jenkins master, once per container lifetime.
+        # The marker is only a hint: the master may have been redeployed or
+        # its volume wiped since, so confirm the node still exists.
+        configured_marker = self._configured_marker(agent_name)
+        if configured_marker.exists():
+            if self.agent_configurator.agent_exists(agent_name):
+                result['jenkins_status'] = 'success'
+                return result
+            configured_marker.unlink(missing_ok=True)
         jenkins_success, jenkins_message = self.agent_configurator.configure_agent(
             agent_name,
             agent_name,  # Use container name for direct Docker network communication
@@ -94,80 +182,264 @@ class JenkinsAgent:
         )
         result['jenkins_status'] = 'success' if jenkins_success else 'failed'
         
-        if not jenkins_success:
+        if jenkins_success:
+            configured_marker.touch()
+        else:
             result['error'] = f"Failed to configure agent in Jenkins: {jenkins_message}"
         
         return result
 
-    def _deploy_container(self, agent_name: str, cpu_limit: str, memory_limit: str, ssh_port: int) -> Tuple[bool, str]:
-        """Deploy the Docker container for the agent."""
-        docker_gid = "999"  # default fallback
-        if platform.system() == "Darwin":  # macOS
-            docker_gid = "20"  # staff group ID on macOS
-        else:  # Linux
-            try:
-                docker_gid_cmd = ["getent", "group", "docker"]
-                docker_gid_result = subprocess.run(docker_gid_cmd, capture_output=True, text=True)
-                if docker_gid_result.returncode == 0:
-                    docker_gid = docker_gid_result.stdout.split(':')[2]
-            except FileNotFoundError:
-                pass
-    
-        command = [
-            'docker', 'run',
-            '-d',
-            '--name', agent_name,
+    def _configured_marker(self, agent_name: str) -> Path:
+        """Marker file recording that the agent's Jenkins node was created."""
+        return self.logs_dir / f"{agent_name}.configured"
+
+    def _pool_entry(self, agent_name: str, cpu_limit: str, memory_limit: str, ssh_port: int) -> Dict[str, any]:
+        """Pool record of a container and the settings it was created with."""
+        return {
+            'name': agent_name,
+            'cpus': cpu_limit,
+            'memory': memory_limit,
+            'ssh_port': ssh_port,
+            'public_key': self.ssh_manager.get_public_key(),
+        }
+
+    def _read_pool(self) -> List[Dict[str, any]]:
+        """Records of the stopped containers in the warm pool."""
+        try:
+            pool = json.loads(self.pool_file.read_text())
+        except (OSError, ValueError):
+            return []
+        # Older pool files only list names; those containers' settings are
+        # unknown, so they never match and get recreated
+        return [{'name': entry} if isinstance(entry, str) else entry for entry in pool]
+
+    def _take_from_pool(self, agent_name: str) -> Optional[Dict[str, any]]:
+        """Remove `agent_name` from the warm pool, returning its record if it was there."""
+        with self._pool_lock:
+            pool = self._read_pool()
+            for entry in pool:
+                if entry.get('name') == agent_name:
+                    pool.remove(entry)
+                    self.pool_file.write_text(json.dumps(pool))
+                    return entry
+            return None
+
+    @functools.cached_property
+    def _container_options(self) -> List[str]:
+        """Container options that are the same for every agent.
+        
+        Built on first deploy (looking up the Docker group and reading the
+        public key once) and reused for each agent after that.
+        """
+        return [
             '--network', self.network_name,
-            '--cpus', cpu_limit,
-            '-m', memory_limit,
             '-v', '/var/run/docker.sock:/var/run/docker.sock',
-            '--group-add', docker_gid,
+            '--group-add', _detect_docker_gid(),
             '-v', f'{self.ssh_manager.get_private_key_path()}:/home/jenkins/.ssh/id_rsa',
             '-v', f'{self.logs_dir}:/var/log/jenkins',
             '-e', f'JENKINS_AGENT_SSH_PUBKEY={self.ssh_manager.get_public_key()}',
-            '-p', f'{ssh_port}:22',  # Dynamic port mapping
             '--restart', 'unless-stopped',
+        ]
+
+    def _container_args(self, agent_name: str, cpu_limit: str, memory_limit: str, ssh_port: int) -> List[str]:
+        """Options and image shared by `docker run` and `docker create`."""
+        return [
+            '--name', agent_name,
+            '--cpus', cpu_limit,
+            '-m', memory_limit,
+            '-p', f'{ssh_port}:22',  # Dynamic port mapping
+            *self._container_options,
             self.image
         ]
+
+    def ensure_pool(self, size: int, cpu_limit: str, memory_limit: str) -> List[Tuple[bool, str]]:
+        """Pre-create stopped containers for agents 1..size.
+        
+        `deploy_agent` starts a pooled container with `docker start` instead
+        of `docker run`, skipping container creation and network attachment,
+        as long as it asks for the same limits and the SSH key hasn't changed.
+        Agents that already have a container are left alone.
+        
+        Args:
+            size: Number of agents to keep ready
+            cpu_limit: CPU limit for each container
+            memory_limit: Memory limit for each container
+            
+        Returns:
+            List of (success, message) for each container created
+        """
+        existing = {agent['name'] for agent in self.list_agents()}
+        results = []
+        with self._pool_lock:
+            pool = [entry for entry in self._read_pool() if entry.get('name') in existing]
+            for index in range(1, size + 1):
+                agent_name = self._get_agent_name(index)
+                if agent_name in existing:
+                    continue
+                ssh_port = self._get_ssh_port(index)
+                success, output = self.docker.run_command(
+                    ['docker', 'create', *self._container_args(
+                        agent_name, cpu_limit, memory_limit, ssh_port
+                    )]
+                )
+                results.append((success, output if not success else f"Created {agent_name}"))
+                if success:
+                    pool.append(self._pool_entry(agent_name, cpu_limit, memory_limit, ssh_port))
+            self.pool_file.write_text(json.dumps(pool))
+        return results
+
+    def _deploy_container(self, agent_name: str, cpu_limit: str, memory_limit: str, ssh_port: int) -> Tuple[bool, str]:
+        """Deploy the Docker container for the agent."""
+        pooled = self._take_from_pool(agent_name)
+        if pooled is not None:
+            # Only start the pooled container if it was created with the
+            # requested limits, port and the current SSH key
+            if pooled == self._pool_entry(agent_name, cpu_limit, memory_limit, ssh_port):
+                success, output = self._start_existing(agent_name)
+                if success:
+                    return True, output
+            # Otherwise (or if it can't start) replace it with a fresh one
+            self.docker.run_command(['docker', 'rm', '-f', agent_name])
+        
+        command = [
+            'docker', 'run', '-d',
+            *self._container_args(agent_name, cpu_limit, memory_limit, ssh_port)
+        ]
         
         success, output = self.docker.run_command(command)
-        time.sleep(2)  # Wait for container to start
-        _, docker_logs = self.docker.run_command(['docker', 'logs', agent_name])
-        return success, f"{output}\nContainer Logs:\n{docker_logs}"
+        if success:
+            # A new container needs its Jenkins node set up again
+            self._configured_marker(agent_name).unlink(missing_ok=True)
+            self._wait_until_running(agent_name)
+            return True, output
+        # Container logs are only needed to diagnose a failed start, and only
+        # their end is useful
+        _, docker_logs = self.docker.run_command(['docker', 'logs', '--tail', '200', agent_name])
+        return False, f"{output}\nContainer Logs:\n{docker_logs}"
+
+    def _start_existing(self, agent_name: str) -> Tuple[bool, str]:
+        """Start an already created agent container."""
+        success, output = self.docker.run_command(['docker', 'start', agent_name])
+        if success:
+            self._wait_until_running(agent_name)
+        return success, output
+
+    def _wait_until_running(self, agent_name: str) -> bool:
+        """Poll with backoff (about 3s in total) until the container is running."""
+        for delay in (0.05, 0.1, 0.2, 0.4, 0.8, 1.6):
+            if self.docker.is_container_running(agent_name):
+                return True
+            time.sleep(delay)
+        return self.docker.is_container_running(agent_name)
+
+    def get_agent_logs(self, index: int, tail: Optional[int] = None, tail_bytes: Optional[int] = 256 * 1024) -> Tuple[bool, str]:
+        """Get logs for a specific agent.
+        
+        Args:
+            index: The index of the agent
+            tail: Only return this many trailing lines (all if None)
+            tail_bytes: Only read this many trailing bytes of the log file
+                (the whole file if None)
+        """
+        return self.collect_agent_logs([index], tail, tail_bytes)[0]
+
+    def collect_agent_logs(self, indices: List[int], tail: Optional[int] = None, tail_bytes: Optional[int] = 256 * 1024) -> List[Tuple[bool, str]]:
+        """Get logs for several agents, fetching container logs concurrently.
+        
+        Args:
+            indices: Agent indices to get logs for
+            tail: Only return this many trailing lines per agent (all if None)
+            tail_bytes: Only read this many trailing bytes of each log file
+                (the whole file if None)
+            
+        Returns:
+            List of (success, logs) in the same order as `indices`
+        """
+        results: List[Optional[Tuple[bool, str]]] = [None] * len(indices)
+        pending = []
+        for position, index in enumerate(indices):
+            agent_name = self._get_agent_name(index)
+            log_file = self.logs_dir / f"{agent_name}.log"
+            
+            if log_file.exists():
+                try:
+                    with open(log_file, 'rb') as f:
+                        data = _read_log_tail(f, tail, tail_bytes)
+                    results[position] = True, data.decode('utf-8', 'replace')
+                except Exception as e:
+                    results[position] = False, f"Error reading log file: {str(e)}"
+                continue
+            
+            # If log file doesn't exist, get logs from the container
+            command = ['docker', 'logs', agent_name]
+            if tail is not None:
+                command[2:2] = ['--tail', str(tail)]
+            pending.append((position, command))
+        
+        outputs = self.docker.run_commands_parallel([command for _, command in pending])
+        for (position, _), output in zip(pending, outputs):
+            results[position] = output
+        return results
 
-    def get_agent_logs(self, index: int) -> Tuple[bool, str]:
-        """Get logs for a specific agent."""
+    def iter_agent_logs(self, index: int, tail: Optional[int] = 500) -> Iterator[bytes]:
+        """Stream the last `tail` lines of logs for a specific agent as byte chunks.
+        
+        Reads the agent's log file when present, otherwise the container logs.
+        """
         agent_name = self._get_agent_name(index)
         log_file = self.logs_dir / f"{agent_name}.log"
         
-        if log_file.exists():
-            try:
-                with open(log_file, 'r') as f:
-                    return True, f.read()
-            except Exception as e:
-                return False, f"Error reading log file: {str(e)}"
+        if not log_file.exists():
+            yield from self.docker.iter_logs(agent_name, tail)
+            return
         
-        # If log file doesn't exist, try getting logs from container
-        return self.docker.run_command(['docker', 'logs', agent_name])
+        with open(log_file, 'rb') as f:
+            if tail is None:
+                yield from iter(lambda: f.read(65536), b'')
+            else:
+                yield _read_log_tail(f, tail)
 
-    def deploy_agents(self, count: int, cpu_limit: str, memory_limit: str) -> List[Dict[str, any]]:
+    def deploy_agents(self, count: int, cpu_limit: str, memory_limit: str, max_workers: int = 8) -> List[Dict[str, any]]:
         """Deploy multiple Jenkins agent containers.
         
+        Agent 1 is deployed first because it installs the SSH credentials the
+        other nodes refer to; the rest are then deployed concurrently, since
+        the work is dominated by waiting on Docker and the Jenkins API.
+        
         Args:
             count: Number of agents to deploy
             cpu_limit: CPU limit for each container
             memory_limit: Memory limit for each container
+            max_workers: Maximum number of agents deployed at the same time
             
         Returns:
             List of dictionaries containing deployment status and details for each agent
         """
         console.print(f"[bold blue]Deploying {count} Jenkins agents...[/bold blue]")
-        results = []
         
-        for i in range(1, count + 1):
-            console.print(f"\n[yellow]Deploying agent {i} of {count}...[/yellow]")
-            result = self.deploy_agent(i, cpu_limit, memory_limit)
-            
+        # Fetch the crumb once up front; every agent's node creation reuses it
+        if count >= 1:
+            self.agent_configurator.prefetch_auth()
+        
+        results = [self.deploy_agent(1, cpu_limit, memory_limit)] if count >= 1 else []
+        if count > 1:
+            with ThreadPoolExecutor(max_workers=max(1, min(count - 1, max_workers))) as executor:
+                futures = [
+                    executor.submit(self.deploy_agent, i, cpu_limit, memory_limit)
+                    for i in range(2, count + 1)
+                ]
+                # Collect in index order so output and results stay deterministic;
+                # nothing is printed until all workers are done
+                try:
+                    results.extend(future.result() for future in futures)
+                except KeyboardInterrupt:
+                    # Don't start agents that haven't begun yet; only the
+                    # ones already in flight are waited for
+                    for future in futures:
+                        future.cancel()
+                    raise
+        
+        for result in results:
             # Print status
             if result['error']:
                 console.print(f"[red]✗ Agent {result['agent_name']} deployment failed: {result['error']}[/red]")
@@ -176,11 +448,9 @@ class JenkinsAgent:
                 console.print(f"  SSH Port: {result['ssh_port']}")
                 console.print(f"  Container Status: {result['container_status']}")
                 console.print(f"  Jenkins Status: {result['jenkins_status']}")
-            
-            results.append(result)
         
         # Print summary
-        success_count = len([r for r in results if not r['error']])
+        success_count = sum(1 for r in results if not r['error'])
         console.print(f"\n[bold]Deployment Summary:[/bold]")
         console.print(f"Successfully deployed: {success_count}/{count} agents")
         
@@ -198,24 +468,7 @@ class JenkinsAgent:
 
     def list_agents(self) -> List[Dict[str, str]]:
         """List all Jenkins agent containers and their status."""
-        success, output = self.docker.run_command([
-            'docker', 'ps',
-            '-a',
-            '--filter', f'name={self.base_name}',
-            '--format', '{{.Names}}\t{{.Status}}\t{{.ID}}'
-        ])
-        
-        agents = []
-        if success and output:
-            for line in output.split('\n'):
-                if line:
-                    name, status, container_id = line.split('\t')
-                    agents.append({
-                        'name': name,
-                        'status': status,
-                        'id': container_id
-                    })
-        return agents
+        return self.docker.list_containers(self.base_name)
 
     def remove_agent(self, index: int) -> Tuple[bool, str]:
         """Remove a specific agent from both Docker and Jenkins.
@@ -238,15 +491,10 @@ class JenkinsAgent:
                 overall_success = False
                 console.print(f"[yellow]Warning: {jenkins_message}[/yellow]")
         
-        # Stop container
-        stop_success, stop_message = self.docker.run_command(['docker', 'stop', agent_name])
-        if not stop_success:
-            overall_success = False
-            result_message.append(f"Failed to stop container: {stop_message}")
-            console.print(f"[yellow]Warning: Failed to stop container {agent_name}[/yellow]")
-        
-        # Remove container
-        rm_success, rm_message = self.docker.run_command(['docker', 'rm', agent_name])
+        # Stop and remove the container in one step
+        rm_success, rm_message = self.docker.run_command(['docker', 'rm', '-f', agent_name])
+        self._configured_marker(agent_name).unlink(missing_ok=True)
+        self._take_from_pool(agent_name)
         if not rm_success:
             overall_success = False
             result_message.append(f"Failed to remove container: {rm_message}")
@@ -265,6 +513,7 @@ class JenkinsAgent:
         
         console.print(f"[bold blue]Removing {len(agents)} Jenkins agents...[/bold blue]")
         
+        jenkins_results = []
         for agent in agents:
             agent_name = agent['name']
             console.print(f"[yellow]Removing agent {agent_name}...[/yellow]")
@@ -277,21 +526,39 @@ class JenkinsAgent:
                     console.print(f"[green]✓ Agent {agent_name} deleted from Jenkins[/green]")
                 else:
                     console.print(f"[yellow]Warning: {jenkins_result[1]}[/yellow]")
-            
-            # Remove container
-            docker_result = self.docker.run_command(['docker', 'rm', '-f', agent['id']])
-            if docker_result[0]:
+            jenkins_results.append(jenkins_result)
+        
+        # Remove every container with a single `docker rm -f`; the engine
+        # removes them concurrently. On a partial failure, re-list to find
+        # out which containers are still there.
+        remaining = set()
+        rm_message = ""
+        if agents:
+            rm_success, rm_message = self.docker.run_command(
+                ['docker', 'rm', '-f', *(agent['id'] for agent in agents)]
+            )
+            if not rm_success:
+                remaining = {agent['id'] for agent in self.list_agents()}
+        
+        for agent, jenkins_result in zip(agents, jenkins_results):
+            agent_name = agent['name']
+            docker_success = agent['id'] not in remaining
+            if docker_success:
+                self._configured_marker(agent_name).unlink(missing_ok=True)
+                self._take_from_pool(agent_name)
                 console.print(f"[green]✓ Container {agent_name} removed[/green]")
+                docker_message = "Container removed"
             else:
                 console.print(f"[yellow]Warning: Failed to remove container {agent_name}[/yellow]")
+                docker_message = rm_message
             
             # Combine results
-            combined_success = jenkins_result[0] and docker_result[0]
-            combined_message = f"Jenkins: {jenkins_result[1]}\nDocker: {docker_result[1]}"
+            combined_success = jenkins_result[0] and docker_success
+            combined_message = f"Jenkins: {jenkins_result[1]}\nDocker: {docker_message}"
             results.append((combined_success, combined_message))
         
         # Print summary
-        success_count = len([r for r in results if r[0]])
+        success_count = sum(1 for r in results if r[0])
         console.print(f"\n[bold]Removal Summary:[/bold]")
         console.print(f"Successfully removed: {success_count}/{len(agents)} agents")
         
@@ -1,46 +1,98 @@
 import requests
 import json
-from typing import Tuple, Optional
+import threading
+from typing import Dict, Tuple, Optional
 from pathlib import Path
 import time
 import base64
 
+# orjson is optional; Jenkins reads the compact output the same way
+try:
+    import orjson
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
 class JenkinsAgentConfigurator:
     def __init__(self, jenkins_url: str, username: str, password: str):
         self.jenkins_url = jenkins_url
         self.username = username
         self.password = password
-        self.crumb = None
-        self.session = requests.Session()
-        self.session.auth = (username, password)
+        # requests.Session isn't thread-safe, and agents are deployed from a
+        # thread pool, so each thread gets its own keep-alive session
+        self._local = threading.local()
+        # Crumb response, fetched once and shared by all (concurrent) calls,
+        # along with the cookies of the web session it is bound to
+        self.crumb_data: Optional[dict] = None
+        self._crumb_cookies = requests.cookies.RequestsCookieJar()
+        self._crumb_lock = threading.Lock()
+        # Set once the SSH credentials are known to exist in Jenkins
+        self._credentials_exist = False
     
-    def _get_crumb(self) -> Optional[dict]:
-        """Get Jenkins crumb for CSRF protection."""
-        try:
-            response = self.session.get(
-                f"{self.jenkins_url}/crumbIssuer/api/json",
-            )
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            print(f"Error getting crumb: {str(e)}")
-        return None
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session of the calling thread, created on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.auth = (self.username, self.password)
+            self._local.session = session
+        return session
 
-    def _get_headers(self) -> dict:
-        """Get headers for Jenkins API requests."""
-        headers = {'Content-Type': 'application/json'}
-        if not self.crumb:
-            crumb_data = self._get_crumb()
-            if crumb_data:
-                self.crumb = {crumb_data.get('crumbRequestField'): crumb_data.get('crumb')}
-                headers.update(self.crumb)
-        return headers
+    def _ensure_crumb(self) -> Optional[dict]:
+        """Get the Jenkins crumb for CSRF protection, fetching it only once.
+        
+        The crumb is only valid with the web session it was issued for, so
+        that session's cookies are copied into the calling thread's session.
+        """
+        session = self.session
+        with self._crumb_lock:
+            if self.crumb_data is None:
+                try:
+                    response = session.get(f"{self.jenkins_url}/crumbIssuer/api/json")
+                    if response.status_code == 200:
+                        self.crumb_data = response.json()
+                        self._crumb_cookies = session.cookies.copy()
+                except Exception as e:
+                    print(f"Error getting crumb: {str(e)}")
+            crumb_data, cookies = self.crumb_data, self._crumb_cookies
+        session.cookies.update(cookies)
+        return crumb_data
+
+    def prefetch_auth(self) -> Tuple[Dict[str, str], Optional[dict]]:
+        """Fetch the crumb and its session cookie ahead of a batch of calls.
 
-    def configure_credentials(self, private_key_path: Path) -> Tuple[bool, str]:
-        """Configure SSH credentials in Jenkins master."""
+        Later calls reuse both, so a batch of N agents costs N POSTs plus
+        this one round trip.
+
+        Returns:
+            Tuple of (session cookies, crumb data or None)
+        """
+        crumb_data = self._ensure_crumb()
+        return self._crumb_cookies.get_dict(), crumb_data
+
+    def _get_headers(self, content_type: str = 'application/x-www-form-urlencoded') -> Optional[dict]:
+        """Get headers for Jenkins API requests, or None if no crumb is available."""
+        crumb_data = self._ensure_crumb()
+        if crumb_data is None:
+            return None
+        return {
+            'Content-Type': content_type,
+            crumb_data['crumbRequestField']: crumb_data['crumb']
+        }
+
+    def configure_credentials(self, private_key_path: Optional[Path] = None, private_key_text: Optional[str] = None) -> Tuple[bool, str]:
+        """Configure SSH credentials in Jenkins master.
+        
+        Args:
+            private_key_path: Private key file, read only if the credentials are missing
+            private_key_text: Private key contents, used instead of reading the file
+        """
+        if self._credentials_exist:
+            return True, "Credentials already exist"
         try:
-            session = requests.Session()
-            session.auth = (self.username, self.password)
+            session = self.session
 
             # First verify if credentials already exist
             verify_url = f"{self.jenkins_url}/manage/credentials/store/system/domain/_/api/json?tree=credentials[id]"
@@ -50,26 +102,21 @@ class JenkinsAgentConfigurator:
                 # Check if credentials already exist
                 if any(cred.get("id") == "jenkins-agent-ssh-key" for cred in existing_creds.get("credentials", [])):
                     print("✓ SSH credentials already exist")
+                    self._credentials_exist = True
                     return True, "Credentials already exist"
             
-            # Read private key
-            with open(private_key_path, 'r') as f:
-                private_key = f.read()
+            # Read private key unless the caller already has it
+            private_key = private_key_text
+            if private_key is None:
+                with open(private_key_path, 'r') as f:
+                    private_key = f.read()
 
-            # Get crumb
-            crumb_response = session.get(f"{self.jenkins_url}/crumbIssuer/api/json")
-            if crumb_response.status_code != 200:
-                return False, f"Failed to get crumb: {crumb_response.text[:200]}"
-            
-            crumb_data = crumb_response.json()
-
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                crumb_data['crumbRequestField']: crumb_data['crumb']
-            }
+            headers = self._get_headers()
+            if headers is None:
+                return False, "Failed to get crumb"
 
             form_data = {
-                'json': json.dumps({
+                'json': _dumps({
                     "": "0",
                     "credentials": {
                         "scope": "GLOBAL",
@@ -90,28 +137,36 @@ class JenkinsAgentConfigurator:
 
             create_url = f"{self.jenkins_url}/manage/credentials/store/system/domain/_/createCredentials"
 
+            # Don't follow the redirect: a 302 is Jenkins' success answer, and
+            # following it would fetch an HTML page that looks like a failure
             response = session.post(
                 create_url,
                 headers=headers,
-                data=form_data
+                data=form_data,
+                allow_redirects=False
             )
 
+            # A clean success needs no extra round trip to verify
+            if response.status_code == 302 or (
+                response.status_code in [200, 201] and 'html' not in response.headers.get('Content-Type', '')
+            ):
+                self._credentials_exist = True
+                return True, "Credentials configured successfully"
 
-            # Verify creation
+            # Ambiguous response: check whether the credentials were created anyway
             verify_response = session.get(verify_url)
             if verify_response.status_code == 200:
                 after_creds = verify_response.json()
                 
                 # Verify the credentials were actually created
                 if any(cred.get("id") == "jenkins-agent-ssh-key" for cred in after_creds.get("credentials", [])):
+                    self._credentials_exist = True
                     return True, "Credentials configured successfully"
                 else:
                     return False, "Credentials not found after creation attempt"
 
-            if response.status_code in [200, 201, 302]:
-                if 'html' in response.headers.get('Content-Type', ''):
-                    return False, "Got HTML response instead of credential creation confirmation"
-                return True, "Credentials configured successfully"
+            if response.status_code in [200, 201]:
+                return False, "Got HTML response instead of credential creation confirmation"
             
             return False, f"Failed to configure credentials: {response.text[:200]}"
 
@@ -128,28 +183,17 @@ class JenkinsAgentConfigurator:
             Tuple of (success, message)
         """
         try:
-            session = requests.Session()
-            session.auth = (self.username, self.password)
+            session = self.session
             
             # Check if agent exists
             check_response = session.get(f"{self.jenkins_url}/computer/{agent_name}/api/json")
             if check_response.status_code != 200:
                 return False, f"Agent {agent_name} does not exist or cannot be accessed"
             
-            # Get crumb for CSRF protection
-            crumb_response = session.get(f"{self.jenkins_url}/crumbIssuer/api/json")
-            if crumb_response.status_code != 200:
-                return False, f"Failed to get crumb: {crumb_response.text[:200]}"
-            
-            crumb_data = crumb_response.json()
-            crumb_field = crumb_data['crumbRequestField']
-            crumb = crumb_data['crumb']
-            
             # Delete the agent
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                crumb_field: crumb
-            }
+            headers = self._get_headers()
+            if headers is None:
+                return False, "Failed to get crumb"
             
             delete_response = session.post(
                 f"{self.jenkins_url}/computer/{agent_name}/doDelete",
@@ -174,10 +218,7 @@ class JenkinsAgentConfigurator:
             True if the agent exists, False otherwise
         """
         try:
-            session = requests.Session()
-            session.auth = (self.username, self.password)
-            
-            response = session.get(f"{self.jenkins_url}/computer/{agent_name}/api/json")
+            response = self.session.get(f"{self.jenkins_url}/computer/{agent_name}/api/json")
             return response.status_code == 200
         except Exception:
             return False
@@ -185,26 +226,12 @@ class JenkinsAgentConfigurator:
     def configure_agent(self, agent_name: str, host: str = "jenkins-local-agent-1", port: int = 22) -> Tuple[bool, str]:
         """Configure Jenkins agent using SSH."""
         try:
-            session = requests.Session()
-            session.auth = (self.username, self.password)
-
-            # Get cookie first
-            cookie_response = session.get(f"{self.jenkins_url}/computer/new")
-            if cookie_response.status_code != 200:
-                return False, "Failed to get cookie"
-            
-            cookie = cookie_response.cookies.get_dict()
-
-            # Get crumb using cookie
-            crumb_response = session.get(
-                f"{self.jenkins_url}/crumbIssuer/api/json",
-                cookies=cookie
-            )
-            if crumb_response.status_code != 200:
-                return False, f"Failed to get crumb: {crumb_response.text[:200]}"
-            
-            crumb_data = crumb_response.json()
-            crumb = crumb_data['crumb']
+            # The crumb (and the session cookie it belongs to) is shared with
+            # earlier calls, so later agents skip both round trips
+            headers = self._get_headers()
+            if headers is None:
+                return False, "Failed to get crumb"
+            crumb = self.crumb_data['crumb']
 
             # Prepare the JSON payload for SSH launcher
             json_data = {
@@ -274,19 +301,13 @@ class JenkinsAgentConfigurator:
                 "_.freeTempSpaceWarningThreshold": "2GiB",
                 "type": "hudson.slaves.DumbSlave",
                 "Submit": "",
-                "json": json.dumps(json_data)
+                "json": _dumps(json_data)
             }
 
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                crumb_data['crumbRequestField']: crumb
-            }
-
-            response = session.post(
+            response = self.session.post(
                 f"{self.jenkins_url}/computer/doCreateItem",
                 headers=headers,
-                data=form_data,
-                cookies=cookie
+                data=form_data
             )
 
             if response.status_code in [200, 302]:
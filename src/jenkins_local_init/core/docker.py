@@ -1,63 +1,357 @@
 import subprocess
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Iterator, Any, Dict, Set
 import json
+import os
+import socket
+import hashlib
+import threading
+import time
+import http.client
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import quote
+
+from ..config.defaults import JENKINS_LOCAL_DIR
+
+# Touched after a successful daemon probe; while it is younger than the TTL,
+# other invocations skip the probe
+DOCKER_ALIVE_MARKER = JENKINS_LOCAL_DIR / ".docker-alive"
+DOCKER_ALIVE_TTL = 5
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to the Docker daemon over its UNIX socket."""
+
+    def __init__(self, socket_path: str, timeout: float = 60):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+def _find_docker_socket() -> Optional[str]:
+    """Locate the UNIX socket the docker CLI would talk to.
+    
+    Follows DOCKER_HOST and the current docker context the same way the CLI
+    does. Returns None when the daemon isn't reachable over a local socket
+    (e.g. tcp:// or ssh:// hosts), in which case the CLI is used instead.
+    """
+    docker_dir = Path.home() / ".docker"
+    host = os.environ.get("DOCKER_HOST")
+    if not host:
+        context = os.environ.get("DOCKER_CONTEXT")
+        if context is None:
+            try:
+                with open(docker_dir / "config.json") as f:
+                    context = json.load(f).get("currentContext")
+            except (OSError, ValueError):
+                context = None
+        if context and context != "default":
+            meta = docker_dir / "contexts" / "meta" / hashlib.sha256(context.encode()).hexdigest() / "meta.json"
+            try:
+                with open(meta) as f:
+                    host = json.load(f)["Endpoints"]["docker"]["Host"]
+            except (OSError, ValueError, KeyError):
+                return None
+    if host:
+        return host[len("unix://"):] if host.startswith("unix://") else None
+    
+    for candidate in ("/var/run/docker.sock", docker_dir / "run" / "docker.sock"):
+        if os.path.exists(candidate):
+            return str(candidate)
+    return None
 
 class DockerManager:
+    def __init__(self):
+        # Result of the daemon probe, kept for the lifetime of this manager
+        self._docker_running: Optional[bool] = None
+        # Images seen to exist (or built) by this manager; a missing image
+        # is always looked up again since it may be built in the meantime
+        self._known_images: Set[str] = set()
+        # Engine API socket; each thread keeps one keep-alive connection to it
+        self._socket_path = _find_docker_socket()
+        self._local = threading.local()
+        # Network/volume creation is a list-then-create sequence; serialize it
+        # so concurrent callers can't both see a name as missing and create
+        # it twice (Docker allows duplicate network names)
+        self._resource_lock = threading.Lock()
+
+    def _api(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, Any]]:
+        """Call the Docker Engine API over its UNIX socket.
+        
+        Args:
+            method: HTTP method
+            path: API path, e.g. '/networks'
+            body: Optional JSON request body
+            
+        Returns:
+            Tuple of (HTTP status, decoded JSON body), or None if the socket
+            can't be used, in which case callers fall back to the docker CLI
+        """
+        if self._socket_path is None:
+            return None
+        
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = _UnixHTTPConnection(self._socket_path)
+        
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            return None
+        
+        try:
+            decoded = json.loads(data) if data else None
+        except ValueError:
+            decoded = data.decode(errors='replace')
+        return response.status, decoded
+
+    @staticmethod
+    def _api_error(decoded: Any) -> str:
+        """Extract the error message from an Engine API response body."""
+        if isinstance(decoded, dict):
+            return decoded.get('message', str(decoded))
+        return str(decoded)
+
     @staticmethod
-    def run_command(command: List[str]) -> Tuple[bool, str]:
-        """Run a docker command and return result."""
+    def run_command(command: List[str], input_data: Optional[str] = None) -> Tuple[bool, str]:
+        """Run a docker command and return result.
+        
+        `input_data`, if given, is written to the command's stdin (use
+        `docker exec -i` for it to reach the container).
+        """
         try:
             result = subprocess.run(
                 command,
                 check=True,
                 capture_output=True,
-                text=True
+                text=True,
+                input=input_data
             )
             return True, result.stdout
         except subprocess.CalledProcessError as e:
             return False, e.stderr
 
+    @classmethod
+    def run_commands_parallel(cls, commands: List[List[str]], max_workers: int = 8) -> List[Tuple[bool, str]]:
+        """Run independent docker commands concurrently.
+        
+        Args:
+            commands: Commands to run
+            max_workers: Maximum number of commands running at the same time
+            
+        Returns:
+            List of (success, output) in the same order as `commands`
+        """
+        if len(commands) <= 1:
+            return [cls.run_command(command) for command in commands]
+        with ThreadPoolExecutor(max_workers=min(len(commands), max_workers)) as executor:
+            return list(executor.map(cls.run_command, commands))
+
+    @classmethod
+    def run_json_command(cls, command: List[str]) -> Tuple[bool, List[dict]]:
+        """Run a docker command formatted with `--format '{{json .}}'`.
+        
+        Args:
+            command: Full command, already including the JSON --format flag
+            
+        Returns:
+            Tuple of (success, list of decoded objects, one per output line)
+        """
+        success, output = cls.run_command(command)
+        if not success:
+            return False, []
+        return True, [json.loads(line) for line in output.splitlines() if line]
+
+    @staticmethod
+    def iter_logs(container: str, tail: Optional[int] = 500, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Stream a container's logs as raw byte chunks instead of buffering them.
+        
+        Args:
+            container: Name or ID of the container
+            tail: Number of lines to show from the end of the logs (None for all)
+            chunk_size: Maximum number of bytes per chunk
+            
+        Yields:
+            Chunks of log output as soon as docker produces them
+        """
+        command = ['docker', 'logs']
+        if tail is not None:
+            command.extend(['--tail', str(tail)])
+        command.append(container)
+        
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        ) as process:
+            yield from iter(lambda: process.stdout.read1(chunk_size), b'')
+
     def check_docker_running(self) -> bool:
-        """Check if Docker daemon is running."""
-        success, _ = self.run_command(['docker', 'info'])
-        return success
+        """Check if Docker daemon is running.
+        
+        The answer is kept for the lifetime of this manager, and a positive
+        one is shared with other invocations for DOCKER_ALIVE_TTL seconds.
+        """
+        if self._docker_running is None:
+            self._docker_running = self._docker_alive_recently() or self._probe_docker()
+        return self._docker_running
 
-    def create_network(self, name: str) -> Tuple[bool, str]:
-        """Create a Docker network if it doesn't exist."""
-        # Check if network exists
-        success, output = self.run_command([
-            'docker', 'network', 'ls',
-            '--format', '{{.Name}}',
-            '--filter', f'name=^{name}$'
-        ])
+    @staticmethod
+    def _docker_alive_recently() -> bool:
+        """Whether another invocation saw the daemon up within the TTL."""
+        try:
+            return time.time() - DOCKER_ALIVE_MARKER.stat().st_mtime < DOCKER_ALIVE_TTL
+        except OSError:
+            return False
+
+    def _probe_docker(self) -> bool:
+        """Ping the daemon, recording a successful answer in the marker file."""
+        response = self._api('GET', '/_ping')
+        if response is not None:
+            running = response[0] == 200
+        else:
+            running, _ = self.run_command(['docker', 'info'])
+        if running:
+            try:
+                DOCKER_ALIVE_MARKER.touch()
+            except OSError:
+                pass
+        return running
+
+    def _list_resource_names(self, kind: str) -> Tuple[bool, Any]:
+        """List the names of all resources of one kind ('network' or 'volume').
+        
+        Returns:
+            Tuple of (success, set of names), or (False, error message)
+        """
+        response = self._api('GET', f'/{kind}s')
+        if response is not None:
+            status, decoded = response
+            if status != 200:
+                return False, self._api_error(decoded)
+            if kind == 'volume':
+                decoded = decoded.get('Volumes') or []
+            return True, {item['Name'] for item in decoded}
         
+        success, output = self.run_command(['docker', kind, 'ls', '--format', '{{.Name}}'])
         if not success:
             return False, output
+        return True, set(output.split())
+
+    def _create_resource(self, kind: str, name: str) -> Tuple[bool, str]:
+        """Create a single network or volume."""
+        response = self._api('POST', f'/{kind}s/create', {'Name': name})
+        if response is None:
+            return self.run_command(['docker', kind, 'create', name])
+        
+        status, decoded = response
+        if status != 201:
+            return False, self._api_error(decoded)
+        return True, decoded.get('Id') or decoded.get('Name') or name
+
+    def _ensure_resources(self, kind: str, names: List[str]) -> List[Tuple[bool, str]]:
+        """Create the named resources of one kind ('network' or 'volume') that are missing.
+
+        Existing resources are discovered with a single listing call. Calls
+        are serialized across threads; container work can still fan out.
+        """
+        if not names:
+            return []
+
+        with self._resource_lock:
+            success, existing = self._list_resource_names(kind)
+            if not success:
+                return [(False, existing)] * len(names)
+
+            results = []
+            for name in names:
+                if name in existing:
+                    results.append((True, f"{kind.capitalize()} {name} already exists"))
+                else:
+                    results.append(self._create_resource(kind, name))
+            return results
+
+    def ensure_resources(self, networks: List[str], volumes: List[str]) -> Tuple[List[Tuple[bool, str]], List[Tuple[bool, str]]]:
+        """Create any of the given networks and volumes that don't exist yet.
+        
+        Args:
+            networks: Names of the networks to ensure
+            volumes: Names of the volumes to ensure
             
-        if name in output:
-            return True, f"Network {name} already exists"
-            
-        # Create network
-        return self.run_command(['docker', 'network', 'create', name])
+        Returns:
+            Tuple of (network results, volume results), each a list of
+            (success, message) in the same order as the given names
+        """
+        return (
+            self._ensure_resources('network', networks),
+            self._ensure_resources('volume', volumes)
+        )
+
+    def create_network(self, name: str) -> Tuple[bool, str]:
+        """Create a Docker network if it doesn't exist."""
+        return self._ensure_resources('network', [name])[0]
 
     def create_volume(self, name: str) -> Tuple[bool, str]:
         """Create a Docker volume if it doesn't exist."""
-        # Check if volume exists
-        success, output = self.run_command([
-            'docker', 'volume', 'ls',
-            '--format', '{{.Name}}',
-            '--filter', f'name=^{name}$'
+        return self._ensure_resources('volume', [name])[0]
+
+    def list_containers(self, name_filter: str) -> List[Dict[str, str]]:
+        """List containers (running or not) whose name contains `name_filter`.
+        
+        Returns:
+            List of dictionaries with 'name', 'status' and short 'id' keys
+        """
+        filters = quote(json.dumps({'name': [name_filter]}))
+        response = self._api('GET', f'/containers/json?all=1&filters={filters}')
+        if response is not None and response[0] == 200:
+            return [
+                {
+                    'name': container['Names'][0].lstrip('/'),
+                    'status': container['Status'],
+                    'id': container['Id'][:12]
+                }
+                for container in response[1]
+            ]
+        
+        _, containers = self.run_json_command([
+            'docker', 'ps',
+            '-a',
+            '--filter', f'name={name_filter}',
+            '--format', '{{json .}}'
         ])
+        return [
+            {
+                'name': container['Names'],
+                'status': container['Status'],
+                'id': container['ID']
+            }
+            for container in containers
+        ]
+
+    def is_container_running(self, name: str) -> bool:
+        """Check whether a container exists and is in the running state."""
+        response = self._api('GET', f'/containers/{quote(name)}/json')
+        if response is not None:
+            status, decoded = response
+            return status == 200 and bool(decoded['State']['Running'])
         
-        if not success:
-            return False, output
-            
-        if name in output:
-            return True, f"Volume {name} already exists"
-            
-        # Create volume
-        return self.run_command(['docker', 'volume', 'create', name])
+        success, output = self.run_command([
+            'docker', 'inspect', '-f', '{{.State.Running}}', name
+        ])
+        return success and output.strip() == 'true'
 
     def backup_volume(self, volume_name: str, backup_path: Path) -> Tuple[bool, str]:
         """Backup a Docker volume."""
@@ -98,13 +392,23 @@ class DockerManager:
         Returns:
             True if the image exists, False otherwise
         """
-        success, output = self.run_command([
-            'docker', 'images',
-            '--format', '{{.Repository}}:{{.Tag}}',
-            '--filter', f'reference={image_name}'
-        ])
+        if image_name in self._known_images:
+            return True
+        
+        response = self._api('GET', f'/images/{quote(image_name, safe="/:")}/json')
+        if response is not None:
+            exists = response[0] == 200
+        else:
+            success, output = self.run_command([
+                'docker', 'images',
+                '--format', '{{.Repository}}:{{.Tag}}',
+                '--filter', f'reference={image_name}'
+            ])
+            exists = success and output.strip() != ''
         
-        return success and output.strip() != ''
+        if exists:
+            self._known_images.add(image_name)
+        return exists
         
     def build_image(self, dockerfile_path: Path, image_name: str, context_path: Optional[Path] = None) -> Tuple[bool, str]:
         """Build a Docker image from a Dockerfile.
@@ -131,4 +435,7 @@ class DockerManager:
             str(context_path)
         ]
         
-        return self.run_command(command)
\ No newline at end of file
+        success, output = self.run_command(command)
+        if success:
+            self._known_images.add(image_name)
+        return success, output
\ No newline at end of file
@@ -2,16 +2,35 @@ import time
 from pathlib import Path
 from typing import Tuple, Optional
 import subprocess
+import io
+import tarfile
 from ..core.docker import DockerManager
 from ..config.manager import ConfigManager
 import requests
 import time
 import json
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, Iterator
+
+ADMIN_PASSWORD_FILE = "/var/jenkins_home/secrets/initialAdminPassword"
+# Seconds an is_running() answer is reused
+RUNNING_CACHE_TTL = 2.0
+# Where Jenkins runs the setup script from on its next start
+INIT_SCRIPT_PATH = "/var/jenkins_home/init.groovy.d/init.groovy"
+
+
+def groovy_string(value: str) -> str:
+    """Quote a value as a Groovy string literal.
+
+    A JSON string is a valid double-quoted Groovy string once `$` is escaped
+    (so it isn't interpolated); quotes, backslashes and control characters
+    in the value can then no longer break the script.
+    """
+    return json.dumps(value).replace("$", "\\$")
 
 class JenkinsMaster:
     def __init__(self, docker_manager: DockerManager, config_manager: ConfigManager):
         self.docker = docker_manager
+        self.config_manager = config_manager
         self.config = config_manager.get_config()
         self.master_config = self.config["infrastructure"]["master"]
         
@@ -19,18 +38,55 @@ class JenkinsMaster:
         self.network_name = self.config["infrastructure"]["network"]["name"]
         self.volume_name = self.config["infrastructure"]["volume"]["name"]
         self.image = self.master_config["image"]
-        self.host_port = self.master_config["port"]
-        self.jnlp_port = self.master_config["jnlp_port"]
-        self.jenkins_url = f"http://localhost:{self.host_port}"
+        # Public URL set by deploy(); otherwise jenkins_url follows host_port
+        self._public_url: Optional[str] = None
+        # (monotonic time, result) of the last is_running() check; reset by
+        # every method that changes the container's state
+        self._running_cache: Tuple[float, bool] = (0.0, False)
+
+    # Ports are read from the config manager on access, so a port change made
+    # through update_config() is seen without rebuilding this object
+    @property
+    def host_port(self) -> int:
+        return self.config_manager.get_config()["infrastructure"]["master"]["port"]
+
+    @property
+    def jnlp_port(self) -> int:
+        return self.config_manager.get_config()["infrastructure"]["master"]["jnlp_port"]
+
+    @property
+    def jenkins_url(self) -> str:
+        return self._public_url or f"http://localhost:{self.host_port}"
+
+    @jenkins_url.setter
+    def jenkins_url(self, url: str) -> None:
+        self._public_url = url
+
+    @property
+    def api_url(self) -> str:
+        """URL this tool talks to Jenkins on: always the local port, never
+        the public tunnel, and an IPv4 literal so no name lookup (or failed
+        ::1 attempt) precedes each new connection."""
+        return f"http://127.0.0.1:{self.host_port}"
 
     def is_running(self) -> bool:
-        """Check if Jenkins master container is running."""
-        success, output = self.docker.run_command([
-            'docker', 'ps',
-            '--filter', f'name={self.container_name}',
-            '--format', '{{.Status}}'
-        ])
-        return success and 'Up' in output
+        """Check if Jenkins master container is running.
+        
+        The answer is reused for RUNNING_CACHE_TTL seconds, so back-to-back
+        callers within one command share a single `docker ps`.
+        """
+        checked_at, running = self._running_cache
+        if time.monotonic() - checked_at < RUNNING_CACHE_TTL:
+            return running
+        # Inspecting the one container is a single lookup, unlike `docker ps`
+        # which walks every container on the host
+        running = self.docker.is_container_running(self.container_name)
+        self._running_cache = (time.monotonic(), running)
+        return running
+
+    def _invalidate_running(self) -> None:
+        """Forget the cached is_running() answer after a state change."""
+        self._running_cache = (0.0, False)
 
     def deploy(self, public_url: str = None) -> Tuple[bool, str]:
         """Deploy Jenkins master container.
@@ -67,65 +123,114 @@ class JenkinsMaster:
             
         command.append(self.image)
         
+        self._invalidate_running()
         return self.docker.run_command(command)
 
-    def get_admin_password(self) -> Optional[str]:
-        """Get initial admin password."""
+    def get_admin_password(self, timeout: float = 30) -> Optional[str]:
+        """Get initial admin password.
+        
+        If the secrets file isn't there yet, a single `docker exec` waits for
+        it inside the container (checking every 200ms) and prints it, so the
+        password is returned as soon as it is written, without a new process
+        per attempt. The wait loop itself gives up after `timeout` seconds, so
+        nothing is left running in the container if the file never appears.
+        """
         if not self.is_running():
             return None
 
-        # Wait for password file to be created (max 30 seconds)
-        for _ in range(30):
-            success, output = self.docker.run_command([
-                'docker', 'exec',
-                self.container_name,
-                'cat', '/var/jenkins_home/secrets/initialAdminPassword'
-            ])
-            if success:
-                return output.strip()
-            time.sleep(1)
+        # Usually already written when the master was started earlier
+        password = self._read_admin_password()
+        if password:
+            return password
+
+        attempts = max(1, int(timeout / 0.2))
+        try:
+            result = subprocess.run([
+                'docker', 'exec', self.container_name,
+                'sh', '-c',
+                f'i=0; while [ ! -s {ADMIN_PASSWORD_FILE} ] && [ $i -lt {attempts} ]; '
+                f'do sleep 0.2; i=$((i+1)); done; cat {ADMIN_PASSWORD_FILE}'
+            ], capture_output=True, text=True, timeout=timeout + 10)
+        except subprocess.TimeoutExpired:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+
+    def _read_admin_password(self) -> Optional[str]:
+        """Read the initial admin password file, or None if it isn't there yet.
         
-        return None
+        Uses `docker cp` to stream the file out as a tar archive, which avoids
+        starting a process inside the container.
+        """
+        try:
+            result = subprocess.run([
+                'docker', 'cp',
+                f'{self.container_name}:{ADMIN_PASSWORD_FILE}',
+                '-'
+            ], capture_output=True, check=True)
+            with tarfile.open(fileobj=io.BytesIO(result.stdout)) as tar:
+                member = tar.next()
+                password_file = tar.extractfile(member) if member else None
+                if password_file is None:
+                    return None
+                return password_file.read().decode().strip() or None
+        except (subprocess.CalledProcessError, tarfile.TarError):
+            return None
 
     def stop(self) -> Tuple[bool, str]:
         """Stop Jenkins master container."""
+        self._invalidate_running()
         return self.docker.run_command(['docker', 'stop', self.container_name])
 
     def start(self) -> Tuple[bool, str]:
         """Start Jenkins master container."""
+        self._invalidate_running()
         return self.docker.run_command(['docker', 'start', self.container_name])
     
     def restart(self) -> Tuple[bool, str]:
         """Restart Jenkins master container."""
-        stop_success, _ = self.stop()
-        if not stop_success:
-            return False, "Failed to stop container"
-        start_success, _ = self.start()
-        if not start_success:
-            return False, "Failed to start container"
+        self._invalidate_running()
+        success, _ = self.docker.run_command(['docker', 'restart', self.container_name])
+        if not success:
+            return False, "Failed to restart container"
         return True, "Container restarted successfully"
 
     def remove(self) -> Tuple[bool, str]:
         """Remove Jenkins master container."""
         self.stop()
+        self._invalidate_running()
         return self.docker.run_command(['docker', 'rm', self.container_name])
 
     def get_logs(self) -> Tuple[bool, str]:
         """Get container logs."""
         return self.docker.run_command(['docker', 'logs', self.container_name])
 
+    def iter_logs(self, tail: Optional[int] = 500) -> Iterator[bytes]:
+        """Stream the last `tail` lines of the container logs as byte chunks."""
+        return self.docker.iter_logs(self.container_name, tail)
+
     def wait_for_jenkins_ready(self, timeout: int = 180) -> bool:
-        """Wait for Jenkins to be fully up and running."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f"{self.jenkins_url}/login")
-                if response.status_code == 200:
-                    return True
-            except:
-                pass
-            time.sleep(5)
-        return False
+        """Wait for Jenkins to be fully up and running.
+        
+        Polls quickly at first and backs off to every 5 seconds, so a
+        Jenkins that is already (or almost) up is noticed right away.
+        """
+        deadline = time.monotonic() + timeout
+        delays = iter((0.5, 0.5, 1, 1, 2, 2, 3))
+        # One session so successive polls reuse the keep-alive connection
+        with requests.Session() as session:
+            while True:
+                try:
+                    response = session.get(f"{self.api_url}/login", timeout=2)
+                    if response.status_code == 200:
+                        return True
+                except:
+                    pass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(next(delays, 5), remaining))
     
     def configure_initial_setup(self, admin_user: str, admin_password: str) -> Tuple[bool, str]:
         """Configure initial Jenkins setup."""
@@ -136,15 +241,6 @@ class JenkinsMaster:
         # if not initial_password:
         #     return False, "Could not retrieve initial admin password"
 
-        # Create Jenkins home directory
-        success, _ = self.docker.run_command([
-            'docker', 'exec',
-            self.container_name,
-            'mkdir', '-p', '/var/jenkins_home/init.groovy.d'
-        ])
-        if not success:
-            return False, "Failed to create init.groovy.d directory"
-
         # Create initialization script with URL configuration if available
         jenkins_url_config = ""
         if self.jenkins_url and self.jenkins_url != f"http://localhost:{self.host_port}":
@@ -152,7 +248,7 @@ class JenkinsMaster:
 // Configure Jenkins URL
 import jenkins.model.JenkinsLocationConfiguration
 def locationConfig = JenkinsLocationConfiguration.get()
-locationConfig.setUrl("{self.jenkins_url}")
+locationConfig.setUrl({groovy_string(self.jenkins_url)})
 locationConfig.save()
 println("Jenkins URL configured to: " + locationConfig.getUrl())
 """
@@ -168,7 +264,7 @@ def instance = Jenkins.getInstance()
 
 // Create first admin user
 def hudsonRealm = new HudsonPrivateSecurityRealm(false)
-hudsonRealm.createAccount("{admin_user}", "{admin_password}")
+hudsonRealm.createAccount({groovy_string(admin_user)}, {groovy_string(admin_password)})
 instance.setSecurityRealm(hudsonRealm)
 
 // Configure authorization
@@ -193,19 +289,23 @@ instance.setInstallState(InstallState.INITIAL_SETUP_COMPLETED)
 instance.save()
 
 {jenkins_url_config}
+
+// Everything above is saved in Jenkins' own config now; remove this script
+// so the admin credentials don't stay on disk
+new File({groovy_string(INIT_SCRIPT_PATH)}).delete()
 """
         
-        # Write initialization script to container
-        with open('/tmp/init.groovy', 'w') as f:
-            f.write(init_script)
-        
+        # Create the init.groovy.d directory and write the script into it in
+        # one exec, streaming the script through stdin; it is only readable
+        # by the container user
         success, _ = self.docker.run_command([
-            'docker', 'cp',
-            '/tmp/init.groovy',
-            f'{self.container_name}:/var/jenkins_home/init.groovy.d/init.groovy'
-        ])
+            'docker', 'exec', '-i',
+            self.container_name,
+            'sh', '-c',
+            f'umask 077 && mkdir -p {Path(INIT_SCRIPT_PATH).parent} && cat > {INIT_SCRIPT_PATH}'
+        ], input_data=init_script)
         if not success:
-            return False, "Failed to copy initialization script"
+            return False, "Failed to write initialization script"
 
         # Restart Jenkins to apply changes
         self.restart()
@@ -223,7 +323,7 @@ instance.save()
 
         # Get CSRF token (crumb)
         try:
-            crumb_response = session.get(f"{self.jenkins_url}/crumbIssuer/api/json")
+            crumb_response = session.get(f"{self.api_url}/crumbIssuer/api/json")
             if crumb_response.status_code != 200:
                 return False, f"Failed to get CSRF token: {crumb_response.status_code}"
             
@@ -232,53 +332,99 @@ instance.save()
         except Exception as e:
             return False, f"Failed to get CSRF token: {str(e)}"
 
-        # Install each plugin
-        installed_plugins = []
+        # Fetch the installed plugins once, asking only for their short names
+        # instead of the full depth=1 listing
+        already_installed = set()
+        try:
+            plugin_info_response = session.get(f"{self.api_url}/pluginManager/api/json?tree=plugins[shortName]")
+            if plugin_info_response.status_code == 200:
+                already_installed = {p['shortName'] for p in plugin_info_response.json().get('plugins', [])}
+        except Exception:
+            pass
+
+        installed_plugins = [plugin for plugin in plugins if plugin in already_installed]
         failed_plugins = []
+        to_install = [plugin for plugin in plugins if plugin not in already_installed]
 
-        for plugin in plugins:
+        install_url = f"{self.api_url}/pluginManager/installNecessaryPlugins"
+        headers = {'Content-Type': 'text/xml'}
+        headers.update(crumb_header)
+
+        def post_install(names: list):
+            xml_data = "<jenkins>" + "".join(f'<install plugin="{name}@latest" />' for name in names) + "</jenkins>"
+            return session.post(install_url, data=xml_data, headers=headers)
+
+        # Install all missing plugins in one request, so Jenkins resolves
+        # their dependencies in a single pass
+        batch_ok = False
+        if to_install:
             try:
-                # Check if plugin is already installed
-                plugin_info_url = f"{self.jenkins_url}/pluginManager/api/json?depth=1"
-                plugin_info_response = session.get(plugin_info_url)
-                if plugin_info_response.status_code == 200:
-                    plugin_data = plugin_info_response.json()
-                    installed = any(p['shortName'] == plugin for p in plugin_data.get('plugins', []))
+                batch_ok = post_install(to_install).status_code in (200, 302)
+            except Exception:
+                pass
+        if batch_ok:
+            installed_plugins.extend(to_install)
+        else:
+            # Fall back to one request per plugin to find out which ones fail
+            for plugin in to_install:
+                try:
+                    response = post_install([plugin])
                     
-                    if installed:
+                    if response.status_code in (200, 302):
                         installed_plugins.append(plugin)
-                        continue
-
-                # Install plugin
-                install_url = f"{self.jenkins_url}/pluginManager/installNecessaryPlugins"
-                xml_data = f'<jenkins><install plugin="{plugin}@latest" /></jenkins>'
-                headers = {'Content-Type': 'text/xml'}
-                headers.update(crumb_header)
-                
-                response = session.post(install_url, data=xml_data, headers=headers)
-                
-                if response.status_code in (200, 302):
-                    installed_plugins.append(plugin)
-                else:
-                    failed_plugins.append(f"{plugin} (HTTP {response.status_code})")
-            except Exception as e:
-                failed_plugins.append(f"{plugin} (Error: {str(e)})")
-
-        # Wait for plugins to be installed
-        time.sleep(100)
+                    else:
+                        failed_plugins.append(f"{plugin} (HTTP {response.status_code})")
+                except Exception as e:
+                    failed_plugins.append(f"{plugin} (Error: {str(e)})")
+
+        # Wait for the update center to finish, then restart only if one of
+        # the installs needs it
+        restart_needed, job_failures = self._wait_for_plugin_jobs(session)
+        failed_plugins.extend(job_failures)
         
-        # Restart Jenkins to apply plugin changes
-        self.restart()
-        
-        # Wait for Jenkins to come back up
-        if not self.wait_for_jenkins_ready():
-            return False, "Jenkins did not restart properly after plugin installation"
+        if restart_needed:
+            # Restart Jenkins to apply plugin changes
+            self.restart()
+            
+            # Wait for Jenkins to come back up
+            if not self.wait_for_jenkins_ready():
+                return False, "Jenkins did not restart properly after plugin installation"
         
         if failed_plugins:
             return False, f"Failed to install plugins: {', '.join(failed_plugins)}"
         
         return True, f"Successfully installed plugins: {', '.join(installed_plugins)}"
 
+    def _wait_for_plugin_jobs(self, session: requests.Session, timeout: float = 300) -> Tuple[bool, list]:
+        """Poll the update center until no plugin installation is pending.
+        
+        Returns:
+            Tuple of (whether a restart is needed, failed plugins). If the
+            jobs don't finish within `timeout` seconds a restart is assumed
+            to be needed, as before.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                response = session.get(f"{self.api_url}/updateCenter/api/json?depth=1")
+                if response.status_code == 200:
+                    data = response.json()
+                    jobs = [job for job in data.get('jobs', []) if job.get('type') == 'InstallationJob']
+                    statuses = [(job.get('status') or {}).get('type') for job in jobs]
+                    if not any(status in ('Pending', 'Installing') for status in statuses):
+                        restart_needed = bool(data.get('restartRequiredForCompletion')) or any(
+                            job.get('requiresRestart') for job in jobs
+                        )
+                        failed = [
+                            f"{job.get('name')} (installation failed)"
+                            for job, status in zip(jobs, statuses) if status == 'Failure'
+                        ]
+                        return restart_needed, failed
+            except Exception:
+                pass
+            time.sleep(1)
+        return True, []
+
     def run_command_in_container(self, command: list, input_data: str = None) -> str:
         """Run a command inside the Jenkins container.
         
@@ -2,19 +2,39 @@ import subprocess
 import json
 import time
 import os
+import re
+import signal
 import requests
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from ..config.manager import ConfigManager
+from .jenkins import groovy_string
+
+# The <jenkinsUrl> element of JenkinsLocationConfiguration.xml
+_JENKINS_URL_RE = re.compile(rb'<jenkinsUrl>.*?</jenkinsUrl>', re.DOTALL)
+
+# How long a recorded config.xml fallback is preferred over the CLI route;
+# after that the CLI, which needs no restart, is tried first again
+URL_STRATEGY_XML_TTL = 3600
 
 class NgrokManager:
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager.get_config()
         self.ngrok_dir = Path(self.config["directories"]["ngrok"])
-        self.ngrok_dir.mkdir(parents=True, exist_ok=True)
+        # Normally created with the rest of the layout on first run
+        if not self.ngrok_dir.is_dir():
+            self.ngrok_dir.mkdir(parents=True, exist_ok=True)
         self.config_path = self.ngrok_dir / "ngrok.yml"
         self.auth_token_file = self.ngrok_dir / "auth_token"
-        self.api_url = "http://localhost:4040/api"
+        self.api_url = "http://127.0.0.1:4040/api"
+        # Keep-alive session for the local API, which start/stop poll repeatedly
+        self._http = requests.Session()
+        # PID of the ngrok process we started, so stop_tunnel() can end just
+        # that one (also from a later invocation)
+        self.pid_file = self.ngrok_dir / "ngrok.pid"
+        self._proc: Optional[subprocess.Popen] = None
+        # Records which way of updating the Jenkins URL worked last
+        self.url_strategy_file = self.ngrok_dir / "url-update-strategy"
         
     def is_installed(self) -> bool:
         """Check if ngrok is installed on the system."""
@@ -34,12 +54,17 @@ class NgrokManager:
         return self.auth_token_file.exists()
     
     def save_auth_token(self, token: str) -> None:
-        """Save the ngrok auth token."""
-        with open(self.auth_token_file, 'w') as f:
+        """Save the ngrok auth token, readable only by the current user."""
+        try:
+            # A new file gets mode 0600 as it is created, so the token is
+            # never readable by others, even briefly
+            fd = os.open(self.auth_token_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # An existing file keeps its mode on open; tighten it explicitly
+            fd = os.open(self.auth_token_file, os.O_WRONLY | os.O_TRUNC)
+            os.chmod(self.auth_token_file, 0o600)
+        with os.fdopen(fd, 'w') as f:
             f.write(token)
-        
-        # Set appropriate permissions
-        os.chmod(self.auth_token_file, 0o600)
     
     def get_auth_token(self) -> Optional[str]:
         """Get the saved auth token if it exists."""
@@ -69,33 +94,40 @@ class NgrokManager:
         except Exception as e:
             return False, f"Error during authentication: {str(e)}"
     
-    def is_running(self) -> bool:
-        """Check if ngrok is currently running."""
+    def _fetch_tunnels(self) -> Optional[List[Dict[str, Any]]]:
+        """List the agent's tunnels, or None if ngrok isn't running.
+        
+        A successful answer from the local API already means ngrok is up,
+        so callers need no separate is_running() round trip.
+        """
         try:
-            response = requests.get(f"{self.api_url}/tunnels")
-            return response.status_code == 200
+            # The API is local; a short timeout keeps a hung ngrok from
+            # blocking the command
+            response = self._http.get(f"{self.api_url}/tunnels", timeout=1.0)
+            if response.status_code != 200:
+                return None
+            return response.json().get('tunnels', [])
         except:
-            return False
+            return None
+
+    @staticmethod
+    def _https_url(tunnels: List[Dict[str, Any]]) -> Optional[str]:
+        """Public URL of the first https tunnel, if any."""
+        for tunnel in tunnels:
+            if tunnel.get('proto') == 'https':
+                return tunnel.get('public_url')
+        return None
+
+    def is_running(self) -> bool:
+        """Check if ngrok is currently running."""
+        return self._fetch_tunnels() is not None
     
     def get_public_url(self) -> Optional[str]:
         """Get the public URL of the active tunnel if any."""
-        if not self.is_running():
-            return None
-            
-        try:
-            response = requests.get(f"{self.api_url}/tunnels")
-            if response.status_code != 200:
-                return None
-                
-            tunnels = response.json().get('tunnels', [])
-            for tunnel in tunnels:
-                # Find any https tunnel
-                if tunnel.get('proto') == 'https':
-                    return tunnel.get('public_url')
-            
-            return None
-        except:
+        tunnels = self._fetch_tunnels()
+        if tunnels is None:
             return None
+        return self._https_url(tunnels)
     
     def start_tunnel(self, port: int) -> Tuple[bool, str]:
         """Start an ngrok tunnel to the specified port.
@@ -112,16 +144,18 @@ class NgrokManager:
         if not self.is_authenticated():
             return False, "Ngrok is not authenticated. Please run 'jenkins-local-init ngrok auth' first."
             
-        if self.is_running():
-            public_url = self.get_public_url()
+        tunnels = self._fetch_tunnels()
+        if tunnels is not None:
+            public_url = self._https_url(tunnels)
             if public_url:
                 return True, f"Ngrok is already running. Public URL: {public_url}"
             else:
                 self.stop_tunnel()
         
         try:
-            # Start ngrok in the background
-            subprocess.Popen(
+            # Start ngrok in the background. It logs to its own file, and
+            # nothing would ever drain a pipe here
+            self._proc = subprocess.Popen(
                 [
                     "ngrok", "http", 
                     f"{port}", 
@@ -129,33 +163,50 @@ class NgrokManager:
                     "--log-format", "json",
                     "--log-level", "info"
                 ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                # Own session: a Ctrl-C aimed at this command doesn't take
+                # the tunnel down with it
+                start_new_session=True
             )
+            self.pid_file.write_text(str(self._proc.pid))
             
             # Wait for ngrok to start
             max_attempts = 10
             for attempt in range(max_attempts):
                 time.sleep(1)
-                if self.is_running():
-                    public_url = self.get_public_url()
-                    if public_url:
-                        return True, f"Ngrok tunnel started. Public URL: {public_url}"
+                if self._proc.poll() is not None:
+                    # ngrok exited (bad token, port in use, ...): no point waiting
+                    self._proc = None
+                    self.pid_file.unlink(missing_ok=True)
+                    break
+                public_url = self.get_public_url()
+                if public_url:
+                    return True, f"Ngrok tunnel started. Public URL: {public_url}"
             
             return False, "Failed to start ngrok tunnel. Check logs for details."
         except Exception as e:
             return False, f"Error starting ngrok tunnel: {str(e)}"
     
     def stop_tunnel(self) -> Tuple[bool, str]:
-        """Stop any running ngrok tunnels."""
+        """Stop the running ngrok tunnels and the ngrok process."""
         try:
-            # Find ngrok process
-            if os.name == 'nt':  # Windows
-                subprocess.run(["taskkill", "/f", "/im", "ngrok.exe"], 
-                               capture_output=True, check=False)
-            else:  # Unix/Linux/Mac
-                subprocess.run(["pkill", "-f", "ngrok"], 
-                               capture_output=True, check=False)
+            # Close the tunnels through the agent API first, so the public
+            # URL goes away right away
+            for tunnel in self._fetch_tunnels() or []:
+                try:
+                    self._http.delete(f"{self.api_url}/tunnels/{tunnel['name']}", timeout=1.0)
+                except (requests.RequestException, KeyError):
+                    pass
+            
+            if not self._terminate_own_process():
+                # Not started by us: find the ngrok process by name
+                if os.name == 'nt':  # Windows
+                    subprocess.run(["taskkill", "/f", "/im", "ngrok.exe"], 
+                                   capture_output=True, check=False)
+                else:  # Unix/Linux/Mac
+                    subprocess.run(["pkill", "-f", "ngrok"], 
+                                   capture_output=True, check=False)
             
             # Wait for ngrok to stop
             max_attempts = 5
@@ -168,137 +219,187 @@ class NgrokManager:
         except Exception as e:
             return False, f"Error stopping ngrok tunnel: {str(e)}"
     
+    def _read_url_strategy(self) -> Optional[str]:
+        """Method that last updated the Jenkins URL successfully, if recorded.
+        
+        An `xml` record expires after URL_STRATEGY_XML_TTL seconds, since
+        the CLI may only have failed because Jenkins was still starting.
+        """
+        try:
+            strategy = self.url_strategy_file.read_text().strip()
+            if strategy == 'xml' and time.time() - self.url_strategy_file.stat().st_mtime > URL_STRATEGY_XML_TTL:
+                return None
+            return strategy
+        except OSError:
+            return None
+
+    def _save_url_strategy(self, name: str) -> None:
+        if self._read_url_strategy() != name:
+            self.url_strategy_file.write_text(name)
+
+    @staticmethod
+    def _update_url_via_cli(jenkins_master, public_url: str, admin_user: str, admin_password: str) -> Tuple[bool, str]:
+        """Set the Jenkins URL with a Groovy script run through jenkins-cli."""
+        script_content = f"""
+#!/usr/bin/env groovy
+import jenkins.model.JenkinsLocationConfiguration
+
+def locationConfig = JenkinsLocationConfiguration.get()
+locationConfig.setUrl({groovy_string(public_url)})
+locationConfig.save()
+println("Jenkins URL updated to: " + locationConfig.getUrl())
+"""
+        
+        # Pipe the script straight into the Jenkins CLI; nothing is written
+        # to disk and no shell quoting is involved
+        success, output = jenkins_master.docker.run_command([
+            'docker', 'exec', '-i',
+            jenkins_master.container_name,
+            'java', '-jar', '/var/jenkins_home/war/WEB-INF/jenkins-cli.jar',
+            '-s', 'http://localhost:8080/',
+            '-auth', f'{admin_user}:{admin_password}',
+            'groovy', '='
+        ], input_data=script_content)
+        return "Jenkins URL updated to" in output, output
+
+    @staticmethod
+    def _update_url_via_xml(jenkins_master, public_url: str, admin_user: str, admin_password: str) -> Tuple[bool, str]:
+        """Set the Jenkins URL by editing its config file, then restart Jenkins.
+        
+        The file is read and written back as bytes over two execs; only one
+        tag changes, so there's no need to decode it.
+        """
+        config_file = '/var/jenkins_home/jenkins.model.JenkinsLocationConfiguration.xml'
+        result = subprocess.run([
+            'docker', 'exec',
+            jenkins_master.container_name,
+            'cat', config_file
+        ], capture_output=True)
+        if result.returncode != 0 or not result.stdout:
+            return False, result.stderr.decode(errors='replace')
+        
+        # Update the URL in the config.xml
+        replacement = f'<jenkinsUrl>{public_url}</jenkinsUrl>'.encode()
+        updated_config, count = _JENKINS_URL_RE.subn(lambda _: replacement, result.stdout, count=1)
+        if not count:
+            return False, "No <jenkinsUrl> element in the location configuration"
+        
+        # Write the updated config back through stdin
+        result = subprocess.run([
+            'docker', 'exec', '-i',
+            jenkins_master.container_name,
+            'sh', '-c', f'cat > {config_file}'
+        ], input=updated_config, capture_output=True)
+        if result.returncode != 0:
+            return False, result.stderr.decode(errors='replace')
+        
+        # Restart Jenkins to apply the changes
+        jenkins_master.restart()
+        return True, ""
+
+    def _terminate_own_process(self) -> bool:
+        """Terminate the ngrok process started by start_tunnel(), if known.
+        
+        Returns:
+            True if the process was signalled, False if it has to be found
+            some other way
+        """
+        if self._proc is not None:
+            self._proc.terminate()
+            try:
+                # Reap it so no zombie is left behind
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+            self.pid_file.unlink(missing_ok=True)
+            return True
+        
+        try:
+            pid = int(self.pid_file.read_text())
+        except (OSError, ValueError):
+            return False
+        self.pid_file.unlink(missing_ok=True)
+        
+        # Make sure the PID wasn't reused by an unrelated process; if that
+        # can't be checked, leave it to the pkill fallback
+        if not self._is_ngrok_pid(pid):
+            return False
+        try:
+            os.kill(pid, signal.SIGTERM)
+            return True
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _is_ngrok_pid(pid: int) -> bool:
+        """Whether `pid` is a running ngrok process.
+        
+        Reads /proc on Linux and asks `ps` elsewhere (e.g. macOS).
+        """
+        cmdline = Path(f"/proc/{pid}/cmdline")
+        try:
+            if cmdline.exists():
+                return b"ngrok" in cmdline.read_bytes()
+            result = subprocess.run(
+                ['ps', '-p', str(pid), '-o', 'comm='],
+                capture_output=True, text=True, check=False
+            )
+        except OSError:
+            return False
+        return result.returncode == 0 and "ngrok" in result.stdout
+
     def get_tunnel_status(self) -> Dict[str, Any]:
         """Get detailed status of the ngrok tunnel."""
+        tunnels = self._fetch_tunnels()
         status = {
-            "running": self.is_running(),
+            "running": tunnels is not None,
             "public_url": None,
             "tunnels": []
         }
         
-        if not status["running"]:
-            return status
-            
-        try:
-            response = requests.get(f"{self.api_url}/tunnels")
-            if response.status_code == 200:
-                tunnels_data = response.json().get('tunnels', [])
-                status["tunnels"] = tunnels_data
-                
-                # Find the https tunnel
-                for tunnel in tunnels_data:
-                    if tunnel.get('proto') == 'https':
-                        status["public_url"] = tunnel.get('public_url')
-                        break
-        except:
-            pass
+        if tunnels is not None:
+            status["tunnels"] = tunnels
+            status["public_url"] = self._https_url(tunnels)
             
         return status
     
-    def update_jenkins_url(self, jenkins_master, admin_user: str, admin_password: str) -> Tuple[bool, str]:
+    def update_jenkins_url(self, jenkins_master, admin_user: str, admin_password: str, public_url: Optional[str] = None) -> Tuple[bool, str]:
         """Update Jenkins URL configuration to use the ngrok public URL.
         
         Args:
             jenkins_master: JenkinsMaster instance
             admin_user: Jenkins admin username
             admin_password: Jenkins admin password
+            public_url: Tunnel URL the caller already looked up; fetched
+                from the ngrok API if not given
             
         Returns:
             Tuple of (success, message)
         """
-        public_url = self.get_public_url()
+        if public_url is None:
+            public_url = self.get_public_url()
         if not public_url:
             return False, "No active ngrok tunnel found"
             
         try:
-            # Create a simple Groovy script to update the Jenkins URL
-            script_content = f"""
-#!/usr/bin/env groovy
-import jenkins.model.JenkinsLocationConfiguration
-
-def locationConfig = JenkinsLocationConfiguration.get()
-locationConfig.setUrl("{public_url}")
-locationConfig.save()
-println("Jenkins URL updated to: " + locationConfig.getUrl())
-"""
+            # Start with whichever method worked last time: when the CLI
+            # route fails (it spins up a JVM first), it tends to keep failing
+            # for a while. The xml route restarts Jenkins, so that choice
+            # expires and the CLI gets tried again later.
+            methods = [('cli', self._update_url_via_cli), ('xml', self._update_url_via_xml)]
+            if self._read_url_strategy() == 'xml':
+                methods.reverse()
             
-            # Write the script to a temporary file
-            import tempfile
-            import os
+            output = ""
+            for name, method in methods:
+                success, output = method(jenkins_master, public_url, admin_user, admin_password)
+                if success:
+                    self._save_url_strategy(name)
+                    suffix = " (via config.xml)" if name == 'xml' else ""
+                    return True, f"Jenkins URL updated to {public_url}{suffix}"
             
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.groovy') as temp_file:
-                temp_file.write(script_content)
-                script_path = temp_file.name
-            
-            try:
-                # Copy the script to the container
-                container_script_path = "/tmp/update_jenkins_url.groovy"
-                success, output = jenkins_master.docker.run_command([
-                    'docker', 'cp',
-                    script_path,
-                    f'{jenkins_master.container_name}:{container_script_path}'
-                ])
-                
-                if not success:
-                    os.unlink(script_path)
-                    return False, f"Failed to copy script to container: {output}"
-                
-                # Execute the script in the container using cat to pipe it directly to the groovy command
-                success, output = jenkins_master.docker.run_command([
-                    'docker', 'exec',
-                    jenkins_master.container_name,
-                    'bash', '-c', f"echo '{script_content}' | java -jar /var/jenkins_home/war/WEB-INF/jenkins-cli.jar -s http://localhost:8080/ -auth {admin_user}:{admin_password} groovy ="
-                ])
-                
-                # Clean up the temporary file
-                os.unlink(script_path)
-                
-                if "Jenkins URL updated to" in output:
-                    return True, f"Jenkins URL updated to {public_url}"
-                else:
-                    # Try an alternative approach by directly modifying the config.xml file
-                    # Get the current config.xml
-                    success, config_xml = jenkins_master.docker.run_command([
-                        'docker', 'exec',
-                        jenkins_master.container_name,
-                        'cat', '/var/jenkins_home/jenkins.model.JenkinsLocationConfiguration.xml'
-                    ])
-                    
-                    if success and config_xml:
-                        # Update the URL in the config.xml
-                        import re
-                        updated_config = re.sub(
-                            r'<jenkinsUrl>.*?</jenkinsUrl>',
-                            f'<jenkinsUrl>{public_url}</jenkinsUrl>',
-                            config_xml
-                        )
-                        
-                        # Write the updated config to a temporary file
-                        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_config:
-                            temp_config.write(updated_config)
-                            config_path = temp_config.name
-                        
-                        # Copy the updated config back to the container
-                        success, output = jenkins_master.docker.run_command([
-                            'docker', 'cp',
-                            config_path,
-                            f'{jenkins_master.container_name}:/var/jenkins_home/jenkins.model.JenkinsLocationConfiguration.xml'
-                        ])
-                        
-                        # Clean up the temporary config file
-                        os.unlink(config_path)
-                        
-                        if success:
-                            # Restart Jenkins to apply the changes
-                            jenkins_master.restart()
-                            return True, f"Jenkins URL updated to {public_url} (via config.xml)"
-                    
-                    return False, f"Failed to update Jenkins URL: {output}"
-            finally:
-                # Ensure the temporary file is deleted
-                if os.path.exists(script_path):
-                    os.unlink(script_path)
-                    
-            return False, "Failed to update Jenkins URL"
+            return False, f"Failed to update Jenkins URL: {output}"
         except Exception as e:
             return False, f"Error updating Jenkins URL: {str(e)}"
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Tuple
+from typing import Tuple, Optional
 import subprocess
 from ..config.manager import ConfigManager
 
@@ -10,18 +10,32 @@ class SSHKeyManager:
         self.ssh_dir = Path(self.config["directories"]["ssh"])
         self.private_key_path = self.ssh_dir / "jenkins_agent"
         self.public_key_path = self.ssh_dir / "jenkins_agent.pub"
+        # Key contents, read on first use and dropped on regeneration
+        self._private_key: Optional[str] = None
+        self._public_key: Optional[str] = None
 
-    def generate_key_pair(self) -> Tuple[bool, str]:
-        """Generate a new SSH key pair for Jenkins agents."""
+    def generate_key_pair(self, force: bool = False) -> Tuple[bool, str]:
+        """Generate a new SSH key pair for Jenkins agents.
+        
+        Args:
+            force: Replace an existing key pair instead of keeping it
+        """
+        if self.keys_exist() and not force:
+            return True, "SSH key pair already present"
         try:
             # Create SSH directory if it doesn't exist
             self.ssh_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate key pair using ssh-keygen
+            # ssh-keygen asks before overwriting, so clear the old pair first
+            if force:
+                self.private_key_path.unlink(missing_ok=True)
+                self.public_key_path.unlink(missing_ok=True)
+            
+            # Generate key pair using ssh-keygen; Ed25519 keys are generated
+            # almost instantly, unlike 4096-bit RSA
             result = subprocess.run([
                 'ssh-keygen',
-                '-t', 'rsa',
-                '-b', '4096',
+                '-t', 'ed25519',
                 '-C', 'jenkins-agent@local',
                 '-f', str(self.private_key_path),
                 '-N', ''  # Empty passphrase
@@ -33,6 +47,8 @@ class SSHKeyManager:
             # Set correct permissions
             os.chmod(self.private_key_path, 0o600)
             os.chmod(self.public_key_path, 0o644)
+            self._private_key = None
+            self._public_key = None
             
             return True, "SSH key pair generated successfully"
             
@@ -40,12 +56,20 @@ class SSHKeyManager:
             return False, f"Error generating SSH key pair: {str(e)}"
 
     def get_public_key(self) -> str:
-        """Get the public key content."""
-        try:
-            with open(self.public_key_path, 'r') as f:
-                return f.read().strip()
-        except FileNotFoundError:
-            return ""
+        """Get the public key content, reading the file only once."""
+        if self._public_key is None:
+            try:
+                self._public_key = self.public_key_path.read_text().strip()
+            except FileNotFoundError:
+                # Not cached, so keys generated later are picked up
+                return ""
+        return self._public_key
+
+    def get_private_key(self) -> str:
+        """Get the private key content, reading the file only once."""
+        if self._private_key is None:
+            self._private_key = self.private_key_path.read_text()
+        return self._private_key
 
     def get_private_key_path(self) -> str:
         """Get the path to the private key."""
@@ -62,15 +86,25 @@ class SSHKeyManager:
                 return False, "No keys to backup"
             
             backup_dir = self.ssh_dir / "backup"
-            backup_dir.mkdir(exist_ok=True)
+            try:
+                backup_dir.mkdir()
+            except FileExistsError:
+                pass
             
             import shutil
             import datetime
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            shutil.copy(self.private_key_path, backup_dir / f"jenkins_agent_{timestamp}")
-            shutil.copy(self.public_key_path, backup_dir / f"jenkins_agent_{timestamp}.pub")
+            # copy2 also keeps the 0600 mode and timestamps; the two copies are
+            # independent, so they run side by side
+            from concurrent.futures import ThreadPoolExecutor
+            copies = [
+                (self.private_key_path, backup_dir / f"jenkins_agent_{timestamp}"),
+                (self.public_key_path, backup_dir / f"jenkins_agent_{timestamp}.pub"),
+            ]
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda paths: shutil.copy2(*paths), copies))
             
             return True, "SSH keys backed up successfully"
             
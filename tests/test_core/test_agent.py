@@ -0,0 +1,287 @@
+import io
+import json
+
+import pytest
+
+from jenkins_local_init.config.defaults import DEFAULT_CONFIG, thaw
+from jenkins_local_init.core.agent import JenkinsAgent, _read_log_tail
+
+
+class FakeDocker:
+    """Records docker commands instead of running them."""
+
+    def __init__(self, containers=(), failures=None):
+        self.containers = list(containers)
+        self.failures = failures or {}
+        self.commands = []
+
+    def run_command(self, command, input_data=None):
+        self.commands.append(command)
+        for verb, output in self.failures.items():
+            if command[1] == verb:
+                return False, output
+        return True, ""
+
+    def list_containers(self, prefix):
+        return [{'name': name} for name in self.containers if name.startswith(prefix)]
+
+    def is_container_running(self, name):
+        return True
+
+    def verbs(self):
+        return [command[1] for command in self.commands]
+
+
+class FakeConfigManager:
+    def __init__(self, config):
+        self.config = config
+
+    def get_config(self):
+        return self.config
+
+
+class FakeSSHManager:
+    def get_private_key_path(self):
+        return "/keys/id_ed25519"
+
+    def get_public_key(self):
+        return "ssh-ed25519 AAAA test"
+
+
+def make_agent(tmp_path, docker):
+    config = thaw(DEFAULT_CONFIG)
+    config["directories"]["logs"] = str(tmp_path)
+    return JenkinsAgent(docker, FakeConfigManager(config), FakeSSHManager())
+
+
+def fill_pool(agent, *indices, cpu_limit="1", memory_limit="1g"):
+    """Write a pool file as ensure_pool() would have left it."""
+    entries = [
+        agent._pool_entry(agent._get_agent_name(index), cpu_limit, memory_limit, agent._get_ssh_port(index))
+        for index in indices
+    ]
+    agent.pool_file.write_text(json.dumps(entries))
+
+
+def pool_names(agent):
+    return [entry['name'] for entry in json.loads(agent.pool_file.read_text())]
+
+
+def tail(data, **kwargs):
+    return _read_log_tail(io.BytesIO(data), **kwargs)
+
+
+class TestReadLogTail:
+    def test_whole_file_without_limits(self):
+        assert tail(b"a\nb\nc\n") == b"a\nb\nc\n"
+
+    def test_last_lines_with_trailing_newline(self):
+        assert tail(b"a\nb\nc\n", lines=2) == b"b\nc\n"
+
+    def test_last_lines_without_trailing_newline(self):
+        assert tail(b"a\nb\nc", lines=2) == b"b\nc"
+
+    def test_more_lines_than_file(self):
+        assert tail(b"a\nb", lines=10) == b"a\nb"
+
+    def test_zero_lines(self):
+        assert tail(b"a\nb\n", lines=0) == b""
+
+    def test_empty_file(self):
+        assert tail(b"", lines=5) == b""
+
+    def test_carriage_returns_stay_in_their_line(self):
+        data = b"one\ntwo 10%\r20%\rdone\nthree"
+        assert tail(data, lines=2) == b"two 10%\r20%\rdone\nthree"
+
+    def test_crlf_lines(self):
+        assert tail(b"a\r\nb\r\nc\r\n", lines=2) == b"b\r\nc\r\n"
+
+    def test_max_bytes(self):
+        assert tail(b"0123456789", max_bytes=4) == b"6789"
+
+    def test_lines_within_max_bytes(self):
+        assert tail(b"aaaa\nbb\ncc\n", lines=5, max_bytes=6) == b"bb\ncc\n"
+
+    @pytest.mark.parametrize("block_size", [1, 2, 3, 7])
+    def test_lines_across_blocks(self, block_size):
+        data = b"".join(b"line %d\n" % i for i in range(20))
+        expected = b"line 17\nline 18\nline 19\n"
+        assert tail(data, lines=3, block_size=block_size) == expected
+
+
+class TestPool:
+    def test_ensure_pool_creates_missing_agents(self, tmp_path):
+        docker = FakeDocker(containers=["jenkins-local-agent-2"])
+        agent = make_agent(tmp_path, docker)
+
+        results = agent.ensure_pool(3, "1", "1g")
+
+        created = [command[command.index('--name') + 1] for command in docker.commands]
+        assert docker.verbs() == ["create", "create"]
+        assert created == ["jenkins-local-agent-1", "jenkins-local-agent-3"]
+        assert all(success for success, _ in results)
+        assert pool_names(agent) == ["jenkins-local-agent-1", "jenkins-local-agent-3"]
+
+    def test_ensure_pool_records_container_settings(self, tmp_path):
+        agent = make_agent(tmp_path, FakeDocker())
+
+        agent.ensure_pool(1, "3", "6g")
+
+        [entry] = json.loads(agent.pool_file.read_text())
+        assert entry == {
+            'name': "jenkins-local-agent-1",
+            'cpus': "3",
+            'memory': "6g",
+            'ssh_port': agent._get_ssh_port(1),
+            'public_key': "ssh-ed25519 AAAA test",
+        }
+
+    def test_ensure_pool_drops_containers_that_are_gone(self, tmp_path):
+        docker = FakeDocker(containers=["jenkins-local-agent-1"])
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 1, 5)
+
+        agent.ensure_pool(1, "1", "1g")
+
+        assert docker.commands == []
+        assert pool_names(agent) == ["jenkins-local-agent-1"]
+
+    def test_ensure_pool_skips_failed_creates(self, tmp_path):
+        docker = FakeDocker(failures={"create": "no such image"})
+        agent = make_agent(tmp_path, docker)
+
+        results = agent.ensure_pool(1, "1", "1g")
+
+        assert results == [(False, "no such image")]
+        assert json.loads(agent.pool_file.read_text()) == []
+
+    def test_take_from_pool_only_once(self, tmp_path):
+        agent = make_agent(tmp_path, FakeDocker())
+        fill_pool(agent, 1, 2)
+
+        assert agent._take_from_pool("jenkins-local-agent-1")['name'] == "jenkins-local-agent-1"
+        assert agent._take_from_pool("jenkins-local-agent-1") is None
+        assert pool_names(agent) == ["jenkins-local-agent-2"]
+
+    def test_take_from_pool_without_pool_file(self, tmp_path):
+        agent = make_agent(tmp_path, FakeDocker())
+        assert agent._take_from_pool("jenkins-local-agent-1") is None
+
+    def test_deploy_starts_pooled_container(self, tmp_path):
+        docker = FakeDocker()
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 1)
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "1", "1g", agent._get_ssh_port(1))
+
+        assert success
+        assert docker.verbs() == ["start"]
+        assert pool_names(agent) == []
+
+    def test_deploy_with_other_limits_recreates_pooled_container(self, tmp_path):
+        docker = FakeDocker()
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 1, cpu_limit="1", memory_limit="1g")
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "4", "8g", agent._get_ssh_port(1))
+
+        assert success
+        assert docker.verbs() == ["rm", "run"]
+        run = docker.commands[-1]
+        assert run[run.index('--cpus') + 1] == "4"
+        assert run[run.index('-m') + 1] == "8g"
+        assert pool_names(agent) == []
+
+    def test_deploy_after_key_change_recreates_pooled_container(self, tmp_path):
+        docker = FakeDocker()
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 1)
+        agent.ssh_manager.get_public_key = lambda: "ssh-ed25519 BBBB regenerated"
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "1", "1g", agent._get_ssh_port(1))
+
+        assert success
+        assert docker.verbs() == ["rm", "run"]
+
+    def test_deploy_recreates_container_from_old_pool_file(self, tmp_path):
+        docker = FakeDocker()
+        agent = make_agent(tmp_path, docker)
+        agent.pool_file.write_text(json.dumps(["jenkins-local-agent-1"]))
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "1", "1g", agent._get_ssh_port(1))
+
+        assert success
+        assert docker.verbs() == ["rm", "run"]
+
+    def test_deploy_replaces_pooled_container_that_fails_to_start(self, tmp_path):
+        docker = FakeDocker(failures={"start": "cannot start"})
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 1)
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "1", "1g", agent._get_ssh_port(1))
+
+        assert success
+        assert docker.verbs() == ["start", "rm", "run"]
+
+    def test_new_container_clears_configured_marker(self, tmp_path):
+        agent = make_agent(tmp_path, FakeDocker())
+        marker = agent._configured_marker("jenkins-local-agent-1")
+        marker.touch()
+
+        success, _ = agent._deploy_container("jenkins-local-agent-1", "1", "1g", 2222)
+
+        assert success
+        assert not marker.exists()
+
+    def test_name_conflict_outside_pool_is_reported(self, tmp_path):
+        docker = FakeDocker(failures={"run": 'Conflict. The container name is already in use'})
+        agent = make_agent(tmp_path, docker)
+
+        success, output = agent._deploy_container("jenkins-local-agent-1", "1", "1g", 2222)
+
+        assert not success
+        assert "already in use" in output
+        assert "start" not in docker.verbs()
+
+
+class FakeConfigurator:
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.configured = []
+
+    def agent_exists(self, agent_name):
+        return agent_name in self.existing
+
+    def configure_agent(self, agent_name, host, port):
+        self.configured.append(agent_name)
+        self.existing.add(agent_name)
+        return True, "configured"
+
+
+class TestConfiguredMarker:
+    def test_marker_skips_configuring_a_known_node(self, tmp_path):
+        docker = FakeDocker()
+        agent = make_agent(tmp_path, docker)
+        fill_pool(agent, 2)
+        agent._configured_marker("jenkins-local-agent-2").touch()
+        agent.agent_configurator = FakeConfigurator(existing=["jenkins-local-agent-2"])
+
+        result = agent.deploy_agent(2, "1", "1g")
+
+        assert result['jenkins_status'] == 'success'
+        assert docker.verbs() == ["start"]
+        assert agent.agent_configurator.configured == []
+
+    def test_stale_marker_is_confirmed_against_jenkins(self, tmp_path):
+        agent = make_agent(tmp_path, FakeDocker())
+        fill_pool(agent, 2)
+        marker = agent._configured_marker("jenkins-local-agent-2")
+        marker.touch()
+        agent.agent_configurator = FakeConfigurator()
+
+        result = agent.deploy_agent(2, "1", "1g")
+
+        assert result['jenkins_status'] == 'success'
+        assert agent.agent_configurator.configured == ["jenkins-local-agent-2"]
+        assert marker.exists()
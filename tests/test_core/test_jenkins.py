@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from jenkins_local_init.core.jenkins import groovy_string
+
+
+def _unquote(literal: str) -> str:
+    """Read a groovy_string() literal back (JSON once `\\$` is undone)."""
+    return json.loads(literal.replace("\\$", "$"))
+
+
+def test_groovy_string_plain_value():
+    assert groovy_string("https://example.ngrok.io") == '"https://example.ngrok.io"'
+
+
+@pytest.mark.parametrize("value", [
+    'say "hi"',
+    "it's",
+    "back\\slash",
+    "line\nbreak",
+    "tab\there",
+    "'''triple'''",
+    "unicode ✓",
+])
+def test_groovy_string_round_trips(value):
+    literal = groovy_string(value)
+    assert literal.startswith('"') and literal.endswith('"')
+    assert "\n" not in literal
+    assert _unquote(literal) == value
+
+
+def test_groovy_string_escapes_interpolation():
+    literal = groovy_string("pa$$${System.exit(0)}")
+    assert "$" not in literal.replace("\\$", "")
+    assert _unquote(literal) == "pa$$${System.exit(0)}"